@@ -5,24 +5,203 @@ Network Device Monitoring System with prioritized Fingerbank API classification
 """
 
 import os
+import re
+import sys
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 
+try:
+    import orjson  # Optional: faster JSON export
+except ImportError:
+    orjson = None
+
 # Import core components
 from .dhcp_log_parser import DHCPLogParser, DHCPLogEntry
 from .mac_vendor_lookup import MACVendorLookup
 from .fingerbank_api import FingerbankAPIClient, DeviceFingerprint
 from .enhanced_classifier import EnhancedFallbackClassifier
+from .dhcp_fingerprint_classifier import DHCPFingerprintClassifier
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Hostname patterns that are so clear they should override ANY Fingerbank confidence
+_CRITICAL_HOSTNAME_PATTERNS = (
+    # Device type clearly specified in hostname
+    'smart-tv', 'smart_tv', '-tv-', 'tv-', 'samsung-tv', 'lg-tv', 'sony-tv',
+    'ring-camera', 'ring-doorbell', 'security-cam', 'ip-camera',
+    'ps4-console', 'ps5-console', 'xbox-', 'nintendo-',
+    'hp-printer', 'canon-printer', 'epson-printer', 'laser-printer',
+    'nest-thermostat', 'smart-thermostat', 'ecobee',
+    'firetv-stick', 'roku-stick', 'appletv', 'chromecast',
+    'echo-dot', 'echo-show', 'google-home', 'homepod'
+)
+
+# Very specific device identifiers that are unlikely to be wrong
+_CRITICAL_OVERRIDE_PATTERNS = (
+    'ring-camera', 'ring-doorbell',  # Ring devices are always cameras
+    'ps4-console', 'ps5-console',     # PlayStation consoles
+    'xbox-one', 'xbox-series',        # Xbox consoles
+    'firetv-stick', 'roku-stick',     # Streaming devices
+    'nest-thermostat',                # Nest thermostats
+    'hp-printer', 'canon-printer'     # Specific printer models
+)
+
+# High-confidence hostname patterns that the enhanced classifier excels at
+_STRONG_HOSTNAME_PATTERNS = (
+    'ring-camera', 'ring-doorbell', 'nest-thermostat', 'nest-cam',
+    'chromecast', 'firetv', 'fire-tv', 'roku', 'appletv',
+    'ps4', 'ps5', 'xbox', 'nintendo', 'switch',
+    'esp32', 'esp8266', 'raspberry', 'arduino',
+    'printer', 'hp-print', 'canon-print', 'epson-print',
+    'echo-', 'alexa-', 'google-home', 'homepod'
+)
+
+# High-confidence hostname patterns that can override Fingerbank, by device type
+_OVERRIDE_HOSTNAME_PATTERNS = {
+    # Smart Home/IoT devices with specific identifiers
+    'Smart Camera': (
+        'ring-camera', 'ring-doorbell', 'nest-cam', 'arlo-camera',
+        'wyze-cam', 'blink-camera', 'eufy-cam', 'security-camera'
+    ),
+    'Smart Speaker': (
+        'echo-dot', 'echo-show', 'echo-studio', 'google-home',
+        'nest-mini', 'homepod', 'alexa-device'
+    ),
+    'Smart Thermostat': (
+        'nest-thermostat', 'ecobee', 'honeywell-thermostat',
+        'smart-thermostat'
+    ),
+    'Streaming Device': (
+        'firetv-stick', 'fire-tv', 'roku-stick', 'chromecast',
+        'appletv', 'nvidia-shield', 'streaming-stick'
+    ),
+    'Gaming Console': (
+        'ps4-console', 'ps5-console', 'xbox-one', 'xbox-series',
+        'nintendo-switch', 'playstation', 'gaming-console'
+    ),
+    'Printer': (
+        'hp-printer', 'canon-printer', 'epson-printer', 'brother-printer',
+        'laser-printer', 'inkjet-printer', 'network-printer'
+    ),
+    'Smart TV': (
+        'smart-tv', 'samsung-tv', 'lg-tv', 'sony-tv',
+        'android-tv', 'webos-tv'
+    ),
+    'Phone': (
+        'iphone-', 'galaxy-s', 'pixel-', 'oneplus-',
+        'huawei-p', 'xiaomi-mi'
+    )
+}
+
+
+def _compile_substring_pattern(patterns) -> re.Pattern:
+    """Compile literal substrings into one alternation so a hostname is scanned once."""
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+
+
+# Chipset/board makers whose OUI says little about the actual device
+_COMPONENT_MANUFACTURERS = ('intel', 'giga-byte', 'micro-star', 'asrock', 'nvidia', 'amd')
+
+# Classification counters, stored in an array indexed by these positions
+_STAT_NAMES = (
+    'vendor_lookup_success', 'fingerbank_success', 'dhcp_fingerprint_success',
+    'fallback_success', 'total_devices'
+)
+(_STAT_VENDOR_LOOKUP, _STAT_FINGERBANK, _STAT_DHCP_FINGERPRINT,
+ _STAT_FALLBACK, _STAT_TOTAL_DEVICES) = range(len(_STAT_NAMES))
+
+# Fingerbank confidence at which a concrete device type is accepted without
+# running the routing and override checks
+FINGERBANK_TRUSTED_CONFIDENCE = 80
+
+# Concurrent Fingerbank requests issued while prefetching a log's devices
+FINGERBANK_MAX_WORKERS = 8
+
+# Result fields produced by the classification pipeline for a given
+# (OUI, fingerprint, vendor class, hostname) input
+_CLASSIFICATION_FIELDS = (
+    'device_type', 'device_name', 'operating_system', 'classification',
+    'classification_method', 'overall_confidence', 'fingerbank_confidence',
+    'dhcp_fingerprint_confidence', 'fingerbank_error'
+)
+
+# Result fields written by export_results, in output order
+_EXPORT_FIELDS = (
+    'mac_address', 'ip_address', 'hostname', 'vendor', 'device_type',
+    'device_name', 'operating_system', 'classification', 'classification_method',
+    'overall_confidence', 'fingerbank_confidence', 'dhcp_fingerprint_confidence',
+    'fingerbank_error', 'dhcp_fingerprint', 'vendor_class'
+)
+_get_export_values = attrgetter(*_EXPORT_FIELDS)
+
+_CRITICAL_HOSTNAME_RE = _compile_substring_pattern(_CRITICAL_HOSTNAME_PATTERNS)
+_STRONG_HOSTNAME_RE = _compile_substring_pattern(_STRONG_HOSTNAME_PATTERNS)
+_CRITICAL_OVERRIDE_RE = _compile_substring_pattern(_CRITICAL_OVERRIDE_PATTERNS)
+
+# Hostname feature bits, computed once per device and shared by the trust,
+# routing and override checks
+_HOSTNAME_CRITICAL = 1 << 0
+_HOSTNAME_STRONG = 1 << 1
+_HOSTNAME_CRITICAL_OVERRIDE = 1 << 2
+
+
+def _hostname_features(hostname_lower: str) -> int:
+    """Summarize which hostname pattern sets match as a bitmask."""
+    features = 0
+    if _CRITICAL_HOSTNAME_RE.search(hostname_lower):
+        features |= _HOSTNAME_CRITICAL
+    if _STRONG_HOSTNAME_RE.search(hostname_lower):
+        features |= _HOSTNAME_STRONG
+    if _CRITICAL_OVERRIDE_RE.search(hostname_lower):
+        features |= _HOSTNAME_CRITICAL_OVERRIDE
+    return features
+
+# One scan over all override patterns: each type's patterns form a named
+# group (t0, t1, ...) inside a lookahead, so match.lastgroup identifies the
+# device type of every occurrence. No pattern is a prefix of another type's
+# pattern, so each match position names exactly one type; keep it that way
+# when adding patterns (tests/test_override_patterns.py checks it).
+_OVERRIDE_TYPES = tuple(_OVERRIDE_HOSTNAME_PATTERNS)
+_OVERRIDE_HOSTNAME_RE = re.compile('(?=' + '|'.join(
+    f'(?P<t{index}>' + '|'.join(re.escape(pattern) for pattern in _OVERRIDE_HOSTNAME_PATTERNS[device_type]) + ')'
+    for index, device_type in enumerate(_OVERRIDE_TYPES)
+) + ')')
+
+# Device categories used to detect Fingerbank/hostname conflicts
+_DEVICE_CATEGORIES = (
+    ('mobile', ('Phone', 'Tablet')),
+    ('computer', ('Computer', 'Laptop', 'Desktop')),
+    ('smart_home', ('Smart Camera', 'Smart Speaker', 'Smart Thermostat', 'Smart TV')),
+    ('entertainment', ('Gaming Console', 'Streaming Device', 'Smart TV')),
+    ('network', ('Network Device', 'Router', 'Access Point')),
+    ('iot', ('IoT Device', 'Smart Camera', 'Smart Speaker', 'Smart Thermostat')),
+)
+
+# Device type -> category; a type listed in several categories maps to the
+# last one, matching the order the categories were originally scanned in
+_TYPE_TO_CATEGORY = {
+    device_type: category
+    for category, device_types in _DEVICE_CATEGORIES
+    for device_type in device_types
+}
+
+_OVERLAPPING_CATEGORIES = frozenset((
+    frozenset(('smart_home', 'iot')),
+    frozenset(('entertainment', 'smart_home')),
+    frozenset(('entertainment', 'iot')),
+))
+
+@dataclass(slots=True)
 class DeviceClassificationResult:
     """Complete device classification result with all available information."""
     mac_address: str
@@ -43,84 +222,136 @@ class DeviceClassificationResult:
     fingerbank_error: Optional[str] = None
     timestamp: datetime = None
 
-class DHCPFingerprintClassifier:
-    """DHCP fingerprint-based device classification."""
-    
-    def __init__(self):
-        """Initialize the DHCP fingerprint classifier."""
-        pass
-    
-    def classify_by_fingerprint(self, fingerprint: str, vendor: str = None, 
-                              vendor_class: str = None, hostname: str = None) -> tuple[Optional[str], str]:
-        """Classify device based on DHCP fingerprint pattern."""
-        if not fingerprint:
-            return None, "none"
-        
-        options = fingerprint.split(',')
-        option_count = len(options)
-        
-        # IoT device detection (minimal options)
-        if option_count <= 3:
-            return self._classify_minimal_device(vendor, vendor_class)
-        elif option_count <= 6:
-            return self._classify_smart_device(options, vendor, vendor_class)
-        elif option_count >= 10:
-            return self._classify_complex_device(options, vendor_class)
-        else:  # 7-9 options - mobile devices
-            return self._classify_mobile_device(options, vendor)
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+
+def _escape_non_ascii(match) -> str:
+    """Escape one character the way json.dumps(ensure_ascii=True) does."""
+    code_point = ord(match.group())
+    if code_point > 0xFFFF:
+        code_point -= 0x10000
+        return '\\u{:04x}\\u{:04x}'.format(0xD800 | (code_point >> 10), 0xDC00 | (code_point & 0x3FF))
+    return '\\u{:04x}'.format(code_point)
+
+
+def _to_indented_json(obj) -> str:
+    """Serialize to two-space indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        # Hand datetimes to default=str so values match the json module output
+        text = orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode('utf-8')
+        # orjson writes raw UTF-8; escape it to match json's ensure_ascii output
+        if not text.isascii():
+            text = _NON_ASCII_RE.sub(_escape_non_ascii, text)
+        return text
+    return json.dumps(obj, indent=2, default=str)
+
+
+_PLAYSTATION_HOSTNAME_RE = re.compile('ps4|ps5|playstation')
+
+
+def _gaming_console_os(hostname_lower: str) -> str:
+    """Tell console families apart by hostname."""
+    if _PLAYSTATION_HOSTNAME_RE.search(hostname_lower):
+        return 'PlayStation OS'
+    return 'Xbox OS' if 'xbox' in hostname_lower else 'Nintendo OS'
+
+
+def _smart_tv_os(hostname_lower: str) -> str:
+    """Tell Smart TV platforms apart by hostname."""
+    if 'android' in hostname_lower:
+        return 'Android TV'
+    return 'webOS' if 'lg' in hostname_lower else 'Tizen'
+
+
+# Operating system per device type; each resolver only checks the hostname
+# hints relevant to its own type
+_OS_RESOLVERS = {
+    'Smart Camera': lambda hostname_lower: 'Linux',
+    'Smart Speaker': lambda hostname_lower: 'Linux',
+    'Smart Thermostat': lambda hostname_lower: 'Linux',
+    'Streaming Device': lambda hostname_lower: 'Android TV' if 'firetv' in hostname_lower else 'Linux',
+    'Gaming Console': _gaming_console_os,
+    'Printer': lambda hostname_lower: 'Embedded OS',
+    'Smart TV': _smart_tv_os,
+    'Phone': lambda hostname_lower: 'iOS' if 'iphone' in hostname_lower else 'Android',
+}
+
+
+@lru_cache(maxsize=1024)
+def _overall_confidence(has_vendor: bool, method: str, fingerbank_tier: int,
+                        dhcp_confidence: Optional[str], has_hostname: bool,
+                        has_vendor_class: bool) -> str:
+    """Score the classification inputs and convert the total to a confidence level."""
+    confidence_score = 0
     
-    def _classify_minimal_device(self, vendor: str = None, vendor_class: str = None) -> tuple[str, str]:
-        """Classify devices with very minimal DHCP options (IoT)."""
-        if vendor:
-            vendor_lower = vendor.lower()
-            if any(iot_vendor in vendor_lower for iot_vendor in ['espressif', 'murata']):
-                return 'IoT Device', 'medium'
-            elif 'philips' in vendor_lower:
-                return 'Smart Lighting', 'medium'
-        return 'IoT Device', 'low'
+    # Vendor confidence
+    if has_vendor:
+        confidence_score += 20
     
-    def _classify_smart_device(self, options: list, vendor: str = None, 
-                             vendor_class: str = None) -> tuple[Optional[str], str]:
-        """Classify smart home/IoT devices with 4-6 options."""
-        if vendor_class:
-            vc_lower = vendor_class.lower()
-            if any(gaming in vc_lower for gaming in ['ps5', 'nintendo', 'xbox']):
-                return 'Gaming Console', 'high'
-            elif any(streaming in vc_lower for streaming in ['roku', 'fire tv', 'chromecast']):
-                return 'Streaming Device', 'high'
-            elif any(smart in vc_lower for smart in ['ring', 'nest', 'hue']):
-                return 'Smart Home Device', 'high'
-        
-        if vendor:
-            vendor_lower = vendor.lower()
-            if 'amazon' in vendor_lower:
-                return 'Smart Speaker', 'medium'
-            elif 'philips' in vendor_lower:
-                return 'Smart Lighting', 'medium'
-            elif 'nintendo' in vendor_lower:
-                return 'Gaming Console', 'high'
-        
-        return 'Smart Home Device', 'low'
+    # Classification method confidence
+    if method == "fingerbank" and fingerbank_tier:
+        if fingerbank_tier == 3:
+            confidence_score += 60
+        elif fingerbank_tier == 2:
+            confidence_score += 40
+        else:
+            confidence_score += 20
+    elif method == "hostname_specific":
+        confidence_score += 50
+    elif method == "dhcp_fingerprint":
+        if dhcp_confidence == "high":
+            confidence_score += 40
+        elif dhcp_confidence == "medium":
+            confidence_score += 25
+        else:
+            confidence_score += 10
+    elif method == "enhanced_fallback":
+        confidence_score += 15
     
-    def _classify_mobile_device(self, options: list, vendor: str = None) -> tuple[str, str]:
-        """Classify mobile devices with 7-9 options."""
-        if vendor:
-            vendor_lower = vendor.lower()
-            if 'apple' in vendor_lower:
-                return 'Phone', 'high'
-            elif any(mobile_vendor in vendor_lower for mobile_vendor in ['samsung', 'google', 'huawei']):
-                return 'Phone', 'high'
-        return 'Phone', 'medium'
+    # Additional information bonus
+    if has_hostname:
+        confidence_score += 10
+    if has_vendor_class:
+        confidence_score += 10
     
-    def _classify_complex_device(self, options: list, vendor_class: str = None) -> tuple[str, str]:
-        """Classify complex devices with 10+ options (typically computers)."""
-        if vendor_class:
-            vc_lower = vendor_class.lower()
-            if 'windows' in vc_lower or 'microsoft' in vc_lower:
-                return 'Computer', 'high'
-            elif 'dhcpcd' in vc_lower or 'linux' in vc_lower:
-                return 'Computer', 'high'
-        return 'Computer', 'medium'
+    # Convert to categorical confidence
+    if confidence_score >= 80:
+        return "high"
+    elif confidence_score >= 50:
+        return "medium"
+    elif confidence_score >= 30:
+        return "low"
+    else:
+        return "unknown"
+
+
+def _fingerbank_confidence_tier(confidence) -> int:
+    """Bucket a Fingerbank score by the thresholds the confidence scoring uses."""
+    if not confidence:
+        return 0
+    if confidence >= 80:
+        return 3
+    if confidence >= 60:
+        return 2
+    return 1
+
+
+def _entry_score(entry: DHCPLogEntry) -> int:
+    """Score how informative a DHCP entry is for classification."""
+    score = 0
+    if entry.hostname:
+        score += 3
+    if entry.vendor_class:
+        score += 2
+    if entry.dhcp_fingerprint:
+        score += 2
+    if entry.message_type == 'ACK':
+        score += 1
+    return score
 
 class OptimizedDHCPDeviceAnalyzer:
     """Optimized DHCP device analyzer with Fingerbank-first classification."""
@@ -132,6 +363,19 @@ class OptimizedDHCPDeviceAnalyzer:
         self.dhcp_fingerprint_classifier = DHCPFingerprintClassifier()
         self.fallback_classifier = EnhancedFallbackClassifier()
         
+        # Vendor lookups keyed by OUI prefix; many MACs share a manufacturer
+        self._vendor_cache = {}
+        
+        # Classification payloads keyed by device input, so identical devices
+        # (same model, different units) only go through the pipeline once per run
+        self._classification_cache = {}
+        
+        # Component manufacturer flag per OUI vendor name, filled on first sight
+        self._component_vendor_cache = {}
+        
+        # Fingerbank requests submitted ahead of classification, keyed like the cache
+        self._fingerbank_futures = {}
+        
         # Initialize Fingerbank API client if key provided
         self.fingerbank_client = None
         if fingerbank_api_key:
@@ -143,66 +387,131 @@ class OptimizedDHCPDeviceAnalyzer:
         else:
             logger.info("No Fingerbank API key provided - using local classification only")
         
-        # Classification statistics
-        self.classification_stats = {
-            'vendor_lookup_success': 0,
-            'fingerbank_success': 0,
-            'dhcp_fingerprint_success': 0,
-            'fallback_success': 0,
-            'total_devices': 0
-        }
+        # Classification statistics, exposed by name through classification_stats
+        self._stats = array('q', [0] * len(_STAT_NAMES))
+    
+    @property
+    def classification_stats(self) -> Dict[str, int]:
+        """Classification counters by name."""
+        return dict(zip(_STAT_NAMES, self._stats))
     
     def analyze_dhcp_log(self, log_file_path: str) -> List[DeviceClassificationResult]:
         """Analyze DHCP log and classify all devices."""
+        results = list(self._iter_device_results(log_file_path))
+        
+        logger.info(f"Classification complete. Results: {len(results)} devices classified")
+        return results
+    
+    def analyze_dhcp_log_columnar(self, log_file_path: str) -> Dict[str, List]:
+        """Analyze DHCP log and return one list per result field instead of result objects."""
+        columns = {field.name: [] for field in fields(DeviceClassificationResult)}
+        column_items = tuple(columns.items())
+        device_count = 0
+        
+        for result in self._iter_device_results(log_file_path):
+            for name, column in column_items:
+                column.append(getattr(result, name))
+            device_count += 1
+        
+        logger.info(f"Classification complete. Results: {device_count} devices classified")
+        return columns
+    
+    def _iter_device_results(self, log_file_path: str):
+        """Parse, group and classify a DHCP log, yielding one result per device."""
         logger.info(f"Starting analysis of DHCP log: {log_file_path}")
         
-        # Parse DHCP log
-        dhcp_entries = self.dhcp_parser.parse_log_file(log_file_path)
-        logger.info(f"Parsed {len(dhcp_entries)} DHCP entries")
+        # Parse the DHCP log lazily and keep only the best entry per device
+        # (MAC address) as entries are read, so memory follows device count
+        best_entries = self._select_best_entries(
+            self.dhcp_parser.parse_log_file_iter(log_file_path)
+        )
+        logger.info(f"Found {len(best_entries)} unique devices")
         
-        # Group entries by device (MAC address)
-        device_entries = self._group_entries_by_device(dhcp_entries)
-        logger.info(f"Found {len(device_entries)} unique devices")
+        # Query Fingerbank concurrently for every distinct device up front
+        if self.fingerbank_client:
+            self._prefetch_fingerbank_results(best_entries)
+        
+        # Classify each device; all results share the run's timestamp
+        run_timestamp = datetime.now()
+        try:
+            for mac_address, best_entry in best_entries.items():
+                result = self._classify_best_entry(mac_address, best_entry, run_timestamp)
+                self._stats[_STAT_TOTAL_DEVICES] += 1
+                yield result
+        finally:
+            # Per-run state: later runs must see fresh Fingerbank results
+            self._fingerbank_futures.clear()
+            self._classification_cache.clear()
+            if self.fingerbank_client:
+                self.fingerbank_client.close()
+    
+    def _prefetch_fingerbank_results(self, best_entries: Dict[str, DHCPLogEntry]):
+        """Submit one Fingerbank request per distinct device input to a thread pool."""
+        pending = {}
+        for mac_address, best_entry in best_entries.items():
+            if not self._has_fingerbank_signals(best_entry):
+                continue
+            cache_key = self._classification_key(mac_address, best_entry)
+            if cache_key in self._classification_cache or cache_key in pending:
+                continue
+            pending[cache_key] = DeviceFingerprint(
+                mac_address=mac_address,
+                dhcp_fingerprint=best_entry.dhcp_fingerprint,
+                dhcp_vendor_class=best_entry.vendor_class,
+                hostname=best_entry.hostname
+            )
         
-        # Classify each device
-        results = []
-        for mac_address, entries in device_entries.items():
-            result = self._classify_device(mac_address, entries)
-            results.append(result)
-            self.classification_stats['total_devices'] += 1
+        if not pending:
+            return
         
-        logger.info(f"Classification complete. Results: {len(results)} devices classified")
-        return results
+        logger.info(f"Querying Fingerbank for {len(pending)} distinct devices")
+        # Requests are I/O bound, so threads overlap the HTTP round-trips
+        with ThreadPoolExecutor(max_workers=min(FINGERBANK_MAX_WORKERS, len(pending))) as executor:
+            for cache_key, device_fingerprint in pending.items():
+                self._fingerbank_futures[cache_key] = executor.submit(
+                    self.fingerbank_client.classify_device, device_fingerprint
+                )
+    
+    def _has_fingerbank_signals(self, dhcp_entry: DHCPLogEntry) -> bool:
+        """Check if an entry carries any DHCP data Fingerbank can classify beyond the MAC."""
+        return bool(dhcp_entry.hostname or dhcp_entry.vendor_class or dhcp_entry.dhcp_fingerprint)
+    
+    def _classification_key(self, mac_address: str, best_entry: DHCPLogEntry) -> Tuple:
+        """Build the key identifying devices that classify identically."""
+        return (
+            mac_address[:8].lower(), best_entry.dhcp_fingerprint,
+            best_entry.vendor_class, best_entry.hostname
+        )
     
-    def _group_entries_by_device(self, dhcp_entries: List[DHCPLogEntry]) -> Dict[str, List[DHCPLogEntry]]:
-        """Group DHCP entries by MAC address (device)."""
-        device_entries = {}
+    def _select_best_entries(self, dhcp_entries: Iterable[DHCPLogEntry]) -> Dict[str, DHCPLogEntry]:
+        """Reduce streamed DHCP entries to the most informative entry per MAC address."""
+        best_entries = {}
+        best_scores = {}
+        entry_count = 0
+        
         for entry in dhcp_entries:
+            entry_count += 1
             mac = entry.mac_address
-            if mac not in device_entries:
-                device_entries[mac] = []
-            device_entries[mac].append(entry)
-        return device_entries
+            score = _entry_score(entry)
+            # Strictly greater keeps the first of equally scored entries
+            if score > best_scores.get(mac, -1):
+                best_scores[mac] = score
+                best_entries[mac] = entry
+        
+        logger.info(f"Parsed {entry_count} DHCP entries")
+        return best_entries
     
-    def _get_best_entry(self, entries: List[DHCPLogEntry]) -> DHCPLogEntry:
-        """Select the most informative DHCP entry for a device."""
-        scored_entries = []
-        for entry in entries:
-            score = 0
-            if entry.hostname:
-                score += 3
-            if entry.vendor_class:
-                score += 2
-            if entry.dhcp_fingerprint:
-                score += 2
-            if entry.message_type == 'ACK':
-                score += 1
-            scored_entries.append((score, entry))
-        
-        scored_entries.sort(key=lambda x: x[0], reverse=True)
-        return scored_entries[0][1]
+    def _lookup_vendor_cached(self, mac_address: str) -> Dict:
+        """Look up the MAC vendor once per OUI prefix."""
+        oui = mac_address[:8].lower()
+        vendor_info = self._vendor_cache.get(oui)
+        if vendor_info is None:
+            vendor_info = self.vendor_lookup.lookup_vendor(mac_address)
+            self._vendor_cache[oui] = vendor_info
+        return vendor_info
     
-    def _classify_device(self, mac_address: str, entries: List[DHCPLogEntry]) -> DeviceClassificationResult:
+    def _classify_best_entry(self, mac_address: str, best_entry: DHCPLogEntry,
+                             timestamp: datetime = None) -> DeviceClassificationResult:
         """
         Classify a single device using Fingerbank-first approach.
         
@@ -211,9 +520,6 @@ class OptimizedDHCPDeviceAnalyzer:
         2. Fingerbank API (Primary classification method)
         3. Local Fallback Methods (Only if Fingerbank fails)
         """
-        # Get the best entry for classification
-        best_entry = self._get_best_entry(entries)
-        
         # Initialize result
         result = DeviceClassificationResult(
             mac_address=mac_address,
@@ -221,21 +527,52 @@ class OptimizedDHCPDeviceAnalyzer:
             hostname=best_entry.hostname,
             dhcp_fingerprint=best_entry.dhcp_fingerprint,
             vendor_class=best_entry.vendor_class,
-            timestamp=datetime.now()
+            timestamp=timestamp or datetime.now()
         )
         
         # Step 1: Vendor lookup (always succeeds)
-        vendor_info = self.vendor_lookup.lookup_vendor(mac_address)
+        vendor_info = self._lookup_vendor_cached(mac_address)
         if vendor_info and vendor_info.get('vendor'):
             result.vendor = vendor_info['vendor']
             result.vendor_confidence = vendor_info.get('confidence', 'unknown')
-            self.classification_stats['vendor_lookup_success'] += 1
+            self._stats[_STAT_VENDOR_LOOKUP] += 1
+        
+        cache_key = self._classification_key(mac_address, best_entry)
+        cached = self._classification_cache.get(cache_key)
+        if cached is not None:
+            payload, stat_bumps = cached
+            for field, value in zip(_CLASSIFICATION_FIELDS, payload):
+                setattr(result, field, value)
+            for stat in stat_bumps:
+                self._stats[stat] += 1
+            logger.debug("Reused cached classification for %s: %s", mac_address, result.device_type)
+            return result
+        
+        stat_bumps = self._run_classification_pipeline(mac_address, best_entry, result, cache_key)
+        for stat in stat_bumps:
+            self._stats[stat] += 1
+        
+        # Transient Fingerbank failures are not cached so later devices retry
+        if not result.fingerbank_error:
+            payload = tuple(getattr(result, field) for field in _CLASSIFICATION_FIELDS)
+            self._classification_cache[cache_key] = (payload, tuple(stat_bumps))
+        
+        return result
+    
+    def _run_classification_pipeline(self, mac_address: str, best_entry: DHCPLogEntry,
+                                     result: DeviceClassificationResult, cache_key: Tuple) -> List[int]:
+        """Run Fingerbank, routing, override and local fallback steps; return the stats to count."""
+        stat_bumps = []
         
         # Step 2: Fingerbank API (Primary Classification Method)
         fingerbank_result = None
         fingerbank_classified = False
         
-        if self.fingerbank_client:
+        # With only a MAC address Fingerbank can do no better than the OUI
+        # vendor we already have, so those devices go straight to local fallback
+        if self.fingerbank_client and not self._has_fingerbank_signals(best_entry):
+            logger.debug("Skipping Fingerbank for %s: no hostname, vendor class or fingerprint", mac_address)
+        elif self.fingerbank_client:
             try:
                 # Create device fingerprint for Fingerbank
                 device_fingerprint = DeviceFingerprint(
@@ -245,14 +582,20 @@ class OptimizedDHCPDeviceAnalyzer:
                     hostname=best_entry.hostname
                 )
                 
-                fingerbank_result = self.fingerbank_client.classify_device(device_fingerprint)
+                # Use the prefetched response when there is one
+                future = self._fingerbank_futures.pop(cache_key, None)
+                if future is not None:
+                    fingerbank_result = future.result()
+                else:
+                    fingerbank_result = self.fingerbank_client.classify_device(device_fingerprint)
                 
                 # DIAGNOSTIC LOG: Analyze input data quality
-                logger.info(f"DIAGNOSTIC [{mac_address}]: Input data quality assessment:")
-                logger.info(f"  - Hostname: {'✓' if best_entry.hostname else '✗'} ({best_entry.hostname or 'None'})")
-                logger.info(f"  - Vendor Class: {'✓' if best_entry.vendor_class else '✗'} ({best_entry.vendor_class or 'None'})")
-                logger.info(f"  - DHCP Fingerprint: {'✓' if best_entry.dhcp_fingerprint else '✗'} ({best_entry.dhcp_fingerprint or 'None'})")
-                logger.info(f"  - MAC Vendor: {result.vendor}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("DIAGNOSTIC [%s]: Input data quality assessment:", mac_address)
+                    logger.info("  - Hostname: %s (%s)", '✓' if best_entry.hostname else '✗', best_entry.hostname or 'None')
+                    logger.info("  - Vendor Class: %s (%s)", '✓' if best_entry.vendor_class else '✗', best_entry.vendor_class or 'None')
+                    logger.info("  - DHCP Fingerprint: %s (%s)", '✓' if best_entry.dhcp_fingerprint else '✗', best_entry.dhcp_fingerprint or 'None')
+                    logger.info("  - MAC Vendor: %s", result.vendor)
                 
                 if fingerbank_result and not fingerbank_result.error_message:
                     result.fingerbank_confidence = fingerbank_result.confidence_score
@@ -267,39 +610,52 @@ class OptimizedDHCPDeviceAnalyzer:
                     if fingerbank_result.operating_system:
                         result.operating_system = fingerbank_result.operating_system
                     
-                    self.classification_stats['fingerbank_success'] += 1
+                    stat_bumps.append(_STAT_FINGERBANK)
                     # DIAGNOSTIC LOG: Fingerbank result analysis
-                    logger.info(f"DIAGNOSTIC [{mac_address}]: Fingerbank classification:")
-                    logger.info(f"  - Device Name: {fingerbank_result.device_name}")
-                    logger.info(f"  - Device Type: {fingerbank_result.device_type}")
-                    logger.info(f"  - Confidence Score: {fingerbank_result.confidence_score}")
-                    logger.info(f"  - Confidence Level: {fingerbank_result.confidence_level}")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("DIAGNOSTIC [%s]: Fingerbank classification:", mac_address)
+                        logger.info("  - Device Name: %s", fingerbank_result.device_name)
+                        logger.info("  - Device Type: %s", fingerbank_result.device_type)
+                        logger.info("  - Confidence Score: %s", fingerbank_result.confidence_score)
+                        logger.info("  - Confidence Level: %s", fingerbank_result.confidence_level)
                     
                     # DIAGNOSTIC LOG: Component manufacturer detection
-                    component_manufacturers = ['intel', 'giga-byte', 'micro-star', 'asrock', 'nvidia', 'amd']
-                    if any(comp in result.vendor.lower() for comp in component_manufacturers):
-                        logger.warning(f"DIAGNOSTIC [{mac_address}]: Component manufacturer detected: {result.vendor}")
-                        logger.warning(f"  - This may indicate hardware component, not device manufacturer")
-                        logger.warning(f"  - Fingerbank classification may be unreliable")
+                    if (logger.isEnabledFor(logging.WARNING) and
+                        self._is_component_manufacturer(result.vendor)):
+                        logger.warning("DIAGNOSTIC [%s]: Component manufacturer detected: %s", mac_address, result.vendor)
+                        logger.warning("  - This may indicate hardware component, not device manufacturer")
+                        logger.warning("  - Fingerbank classification may be unreliable")
                     
-                    logger.debug(f"Fingerbank classified {mac_address}: {fingerbank_result.device_name}")
+                    logger.debug("Fingerbank classified %s: %s", mac_address, fingerbank_result.device_name)
                 else:
                     result.fingerbank_error = fingerbank_result.error_message if fingerbank_result else "No response"
                     
             except Exception as e:
-                logger.warning(f"Fingerbank classification failed for {mac_address}: {e}")
+                logger.warning("Fingerbank classification failed for %s: %s", mac_address, e)
                 result.fingerbank_error = str(e)
         
+        # Hostname pattern checks shared by the trust, routing and override steps
+        hostname_features = (_hostname_features(best_entry.hostname.lower())
+                             if fingerbank_classified and best_entry.hostname else 0)
+        
+        # Step 2.4: Trusted Fingerbank results skip routing and overrides
+        fingerbank_trusted = (fingerbank_classified and
+                              self._is_trusted_fingerbank_result(fingerbank_result, hostname_features))
+        if fingerbank_trusted:
+            logger.debug("Trusted Fingerbank result for %s (confidence %s)",
+                         mac_address, fingerbank_result.confidence_score)
+        
         # Step 2.5: Intelligent Routing Decision (NEW - Enhanced vs Fingerbank)
-        if fingerbank_classified:
+        if fingerbank_classified and not fingerbank_trusted:
             should_use_enhanced = self._should_route_to_enhanced_classifier(
-                fingerbank_result, best_entry, result.vendor
+                fingerbank_result, best_entry, result.vendor, hostname_features
             )
             
-            logger.info(f"DIAGNOSTIC [{mac_address}]: Routing decision analysis:")
-            logger.info(f"  - Fingerbank confidence: {fingerbank_result.confidence_score}")
-            logger.info(f"  - Fingerbank device type: {fingerbank_result.device_type}")
-            logger.info(f"  - Should route to enhanced: {should_use_enhanced}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("DIAGNOSTIC [%s]: Routing decision analysis:", mac_address)
+                logger.info("  - Fingerbank confidence: %s", fingerbank_result.confidence_score)
+                logger.info("  - Fingerbank device type: %s", fingerbank_result.device_type)
+                logger.info("  - Should route to enhanced: %s", should_use_enhanced)
             
             if should_use_enhanced:
                 # Route to enhanced classifier instead of accepting Fingerbank result
@@ -308,27 +664,31 @@ class OptimizedDHCPDeviceAnalyzer:
                     # Use enhanced result instead of Fingerbank
                     result.device_type = enhanced_result['device_type']
                     result.operating_system = enhanced_result.get('operating_system', result.operating_system)
-                    result.classification_method = f"enhanced_preferred_{enhanced_result.get('method', 'unknown')}"
+                    result.classification_method = sys.intern(f"enhanced_preferred_{enhanced_result.get('method', 'unknown')}")
                     result.overall_confidence = enhanced_result.get('confidence', 'medium')
-                    logger.info(f"ENHANCED PREFERRED: {mac_address} reclassified as {result.device_type} (method: {enhanced_result.get('method')})")
-                    self.classification_stats['fallback_success'] += 1  # Count as fallback success
+                    logger.info("ENHANCED PREFERRED: %s reclassified as %s (method: %s)", mac_address, result.device_type, enhanced_result.get('method'))
+                    stat_bumps.append(_STAT_FALLBACK)  # Count as fallback success
                 else:
-                    logger.info(f"ENHANCED FAILED: {mac_address} falling back to Fingerbank result")
+                    logger.info("ENHANCED FAILED: %s falling back to Fingerbank result", mac_address)
             
             # Step 2.6: Selective Fingerbank Override (for remaining cases)
             if not should_use_enhanced and best_entry.hostname:
                 override_result = self._apply_selective_override(
-                    fingerbank_result, best_entry.hostname, result.vendor, result.device_type
+                    fingerbank_result, best_entry.hostname, result.vendor, result.device_type,
+                    hostname_features
                 )
                 if override_result:
                     result.device_type = override_result['device_type']
                     result.operating_system = override_result.get('operating_system', result.operating_system)
                     result.classification_method = override_result['method']
                     result.overall_confidence = 'high'
-                    logger.info(f"Fingerbank override: {mac_address} reclassified as {result.device_type} based on hostname '{best_entry.hostname}'")
+                    logger.info("Fingerbank override: %s reclassified as %s based on hostname '%s'", mac_address, result.device_type, best_entry.hostname)
         
         # Step 3: Local Fallback Classification (only if Fingerbank failed or unavailable)
         if not fingerbank_classified:
+            # Both fallback steps use the same enhanced classification inputs
+            fallback_result = None
+            
             # Try hostname-specific classification first
             if best_entry.hostname:
                 fallback_result = self.fallback_classifier.enhanced_classification(
@@ -341,7 +701,7 @@ class OptimizedDHCPDeviceAnalyzer:
                 if fallback_result.get('hostname_override') and fallback_result.get('device_type'):
                     result.device_type = fallback_result['device_type']
                     result.classification_method = "hostname_specific"
-                    logger.info(f"Hostname fallback: {mac_address} classified as {result.device_type} based on hostname '{best_entry.hostname}'")
+                    logger.info("Hostname fallback: %s classified as %s based on hostname '%s'", mac_address, result.device_type, best_entry.hostname)
                     
                     if fallback_result.get('operating_system') and not result.operating_system:
                         result.operating_system = fallback_result['operating_system']
@@ -359,22 +719,23 @@ class OptimizedDHCPDeviceAnalyzer:
                     result.device_type = dhcp_device_type
                     result.dhcp_fingerprint_confidence = dhcp_confidence
                     result.classification_method = "dhcp_fingerprint"
-                    self.classification_stats['dhcp_fingerprint_success'] += 1
-                    logger.debug(f"DHCP fingerprint fallback classified {mac_address} as {dhcp_device_type}")
+                    stat_bumps.append(_STAT_DHCP_FINGERPRINT)
+                    logger.debug("DHCP fingerprint fallback classified %s as %s", mac_address, dhcp_device_type)
             
             # Enhanced fallback for any remaining gaps
             if not result.device_type or not result.operating_system:
-                fallback_result = self.fallback_classifier.enhanced_classification(
-                    best_entry.hostname,
-                    best_entry.vendor_class,
-                    best_entry.dhcp_fingerprint,
-                    result.vendor
-                )
+                if fallback_result is None:
+                    fallback_result = self.fallback_classifier.enhanced_classification(
+                        best_entry.hostname,
+                        best_entry.vendor_class,
+                        best_entry.dhcp_fingerprint,
+                        result.vendor
+                    )
                 
                 if not result.device_type and fallback_result.get('device_type'):
                     result.device_type = fallback_result['device_type']
                     result.classification_method = "enhanced_fallback"
-                    self.classification_stats['fallback_success'] += 1
+                    stat_bumps.append(_STAT_FALLBACK)
                 
                 if not result.operating_system and fallback_result.get('operating_system'):
                     result.operating_system = fallback_result['operating_system']
@@ -382,91 +743,84 @@ class OptimizedDHCPDeviceAnalyzer:
         # Final result processing
         result.classification = f"{result.device_type or 'Unknown'}"
         result.overall_confidence = self._calculate_overall_confidence(result)
+        return stat_bumps
+    
+    def _is_trusted_fingerbank_result(self, fingerbank_result, hostname_features: int) -> bool:
+        """Check if a high-confidence Fingerbank result cannot be rerouted or overridden."""
+        if fingerbank_result.confidence_score < FINGERBANK_TRUSTED_CONFIDENCE:
+            return False
+        
+        # Above 60 only hardware manufacturer results (routing conditions 2/2b)
+        # and critical hostnames (condition 3, which covers every critical
+        # override pattern) can still change the classification
+        if (fingerbank_result.device_hierarchy and
+            'hardware manufacturer' in ' '.join(fingerbank_result.device_hierarchy).lower()):
+            return False
         
-        return result
+        device_name_lower = (fingerbank_result.device_name or '').lower()
+        if 'hardware manufacturer' in device_name_lower:
+            return False
+        
+        if hostname_features & _HOSTNAME_CRITICAL:
+            return False
+        
+        return True
     
-    def _should_route_to_enhanced_classifier(self, fingerbank_result, dhcp_entry, vendor: str) -> bool:
+    def _should_route_to_enhanced_classifier(self, fingerbank_result, dhcp_entry, vendor: str,
+                                             hostname_features: int) -> bool:
         """Determine if enhanced classifier should be used instead of low-confidence Fingerbank."""
         
         # Condition 1: Very low confidence Fingerbank results (primary routing condition)
         if fingerbank_result.confidence_score <= 40:
-            logger.info(f"Routing condition 1: Low confidence ({fingerbank_result.confidence_score} ≤ 40)")
+            logger.info("Routing condition 1: Low confidence (%s ≤ 40)", fingerbank_result.confidence_score)
             return True
         
         # Condition 2: Hardware Manufacturer classifications (no specific device type)
         if (fingerbank_result.device_hierarchy and 
             'hardware manufacturer' in ' '.join(fingerbank_result.device_hierarchy).lower()):
-            logger.info(f"Routing condition 2: Hardware manufacturer classification")
+            logger.info("Routing condition 2: Hardware manufacturer classification")
             return True
         
         # Condition 2b: Hardware Manufacturer in device name (alternative check)
         if (fingerbank_result.device_name and 
             'hardware manufacturer' in fingerbank_result.device_name.lower()):
-            logger.info(f"Routing condition 2b: Hardware manufacturer in device name")
+            logger.info("Routing condition 2b: Hardware manufacturer in device name")
             return True
         
         # Condition 3: Strong hostname patterns that should always override (regardless of confidence)
-        if (dhcp_entry.hostname and 
-            self._has_critical_hostname_pattern(dhcp_entry.hostname)):
-            logger.info(f"Routing condition 3: Critical hostname pattern override")
+        if hostname_features & _HOSTNAME_CRITICAL:
+            logger.info("Routing condition 3: Critical hostname pattern override")
             return True
         
         # Condition 4: Minimal DHCP data with strong hostname patterns
-        if (dhcp_entry.hostname and 
-            fingerbank_result.confidence_score <= 50 and
-            self._has_strong_hostname_pattern(dhcp_entry.hostname)):
-            logger.info(f"Routing condition 4: Strong hostname pattern with moderate confidence")
+        if (fingerbank_result.confidence_score <= 50 and
+            hostname_features & _HOSTNAME_STRONG):
+            logger.info("Routing condition 4: Strong hostname pattern with moderate confidence")
             return True
         
         # Condition 5: Component manufacturers (often misclassified by Fingerbank)
-        component_manufacturers = ['intel', 'giga-byte', 'micro-star', 'asrock', 'nvidia', 'amd']
-        if (any(comp in vendor.lower() for comp in component_manufacturers) and
+        if (self._is_component_manufacturer(vendor) and
             fingerbank_result.confidence_score <= 60):
-            logger.info(f"Routing condition 5: Component manufacturer with moderate confidence")
+            logger.info("Routing condition 5: Component manufacturer with moderate confidence")
             return True
         
         # Condition 6: Network/embedded device vendor classes (enhanced classifier specializes in these)
         if (dhcp_entry.vendor_class and 
             any(pattern in dhcp_entry.vendor_class.lower() for pattern in ['udhcp', 'busybox', 'dhcpcd']) and
             fingerbank_result.confidence_score <= 55):
-            logger.info(f"Routing condition 6: Network/embedded vendor class")
+            logger.info("Routing condition 6: Network/embedded vendor class")
             return True
         
         return False
     
-    def _has_critical_hostname_pattern(self, hostname: str) -> bool:
-        """Check if hostname has critical patterns that should ALWAYS override Fingerbank."""
-        hostname_lower = hostname.lower()
-        
-        # Patterns that are so clear they should override ANY Fingerbank confidence
-        critical_patterns = [
-            # Device type clearly specified in hostname
-            'smart-tv', 'smart_tv', '-tv-', 'tv-', 'samsung-tv', 'lg-tv', 'sony-tv',
-            'ring-camera', 'ring-doorbell', 'security-cam', 'ip-camera',
-            'ps4-console', 'ps5-console', 'xbox-', 'nintendo-',
-            'hp-printer', 'canon-printer', 'epson-printer', 'laser-printer',
-            'nest-thermostat', 'smart-thermostat', 'ecobee',
-            'firetv-stick', 'roku-stick', 'appletv', 'chromecast',
-            'echo-dot', 'echo-show', 'google-home', 'homepod'
-        ]
-        
-        return any(pattern in hostname_lower for pattern in critical_patterns)
-    
-    def _has_strong_hostname_pattern(self, hostname: str) -> bool:
-        """Check if hostname has strong patterns that enhanced classifier handles well."""
-        hostname_lower = hostname.lower()
-        
-        # High-confidence patterns that enhanced classifier excels at
-        strong_patterns = [
-            'ring-camera', 'ring-doorbell', 'nest-thermostat', 'nest-cam',
-            'chromecast', 'firetv', 'fire-tv', 'roku', 'appletv',
-            'ps4', 'ps5', 'xbox', 'nintendo', 'switch',
-            'esp32', 'esp8266', 'raspberry', 'arduino',
-            'printer', 'hp-print', 'canon-print', 'epson-print',
-            'echo-', 'alexa-', 'google-home', 'homepod'
-        ]
-        
-        return any(pattern in hostname_lower for pattern in strong_patterns)
+    def _is_component_manufacturer(self, vendor: str) -> bool:
+        """Check if the MAC vendor is a hardware component manufacturer."""
+        is_component = self._component_vendor_cache.get(vendor)
+        if is_component is None:
+            vendor_lower = vendor.lower()
+            is_component = any(comp in vendor_lower for comp in _COMPONENT_MANUFACTURERS)
+            self._component_vendor_cache[vendor] = is_component
+        return is_component
     
     def _try_enhanced_classification_preferred(self, dhcp_entry, vendor: str) -> Dict:
         """Try enhanced classification as preferred method over Fingerbank."""
@@ -478,220 +832,105 @@ class OptimizedDHCPDeviceAnalyzer:
             vendor
         )
         
-        logger.info(f"Enhanced classifier result: {enhanced_result}")
+        logger.info("Enhanced classifier result: %s", enhanced_result)
         
         # Accept enhanced result if it has reasonable confidence
         if enhanced_result.get('confidence') in ['high', 'very_high', 'medium']:
             if enhanced_result.get('device_type'):
-                logger.info(f"Enhanced classifier providing: {enhanced_result['device_type']} (confidence: {enhanced_result.get('confidence')})")
+                logger.info("Enhanced classifier providing: %s (confidence: %s)", enhanced_result['device_type'], enhanced_result.get('confidence'))
                 return enhanced_result
         
         # Even accept low confidence if method is hostname-specific (high accuracy)
         if (enhanced_result.get('method') in ['hostname_specific', 'iot_signature'] and
             enhanced_result.get('device_type')):
-            logger.info(f"Enhanced classifier hostname-specific override: {enhanced_result['device_type']}")
+            logger.info("Enhanced classifier hostname-specific override: %s", enhanced_result['device_type'])
             return enhanced_result
         
-        logger.info(f"Enhanced classifier insufficient confidence/data")
+        logger.info("Enhanced classifier insufficient confidence/data")
         return {}
     
-    def _apply_selective_override(self, fingerbank_result, hostname: str, vendor: str, current_device_type: str) -> Dict:
+    def _apply_selective_override(self, fingerbank_result, hostname: str, vendor: str, current_device_type: str,
+                                  hostname_features: int) -> Dict:
         """Selectively override Fingerbank results based on confidence and hostname patterns."""
         if not hostname or not fingerbank_result:
             return None
         
         hostname_lower = hostname.lower()
         
-        # High-confidence hostname patterns that can override Fingerbank
-        high_confidence_patterns = {
-            # Smart Home/IoT devices with specific identifiers
-            'Smart Camera': [
-                'ring-camera', 'ring-doorbell', 'nest-cam', 'arlo-camera', 
-                'wyze-cam', 'blink-camera', 'eufy-cam', 'security-camera'
-            ],
-            'Smart Speaker': [
-                'echo-dot', 'echo-show', 'echo-studio', 'google-home', 
-                'nest-mini', 'homepod', 'alexa-device'
-            ],
-            'Smart Thermostat': [
-                'nest-thermostat', 'ecobee', 'honeywell-thermostat',
-                'smart-thermostat'
-            ],
-            'Streaming Device': [
-                'firetv-stick', 'fire-tv', 'roku-stick', 'chromecast',
-                'appletv', 'nvidia-shield', 'streaming-stick'
-            ],
-            'Gaming Console': [
-                'ps4-console', 'ps5-console', 'xbox-one', 'xbox-series',
-                'nintendo-switch', 'playstation', 'gaming-console'
-            ],
-            'Printer': [
-                'hp-printer', 'canon-printer', 'epson-printer', 'brother-printer',
-                'laser-printer', 'inkjet-printer', 'network-printer'
-            ],
-            'Smart TV': [
-                'smart-tv', 'samsung-tv', 'lg-tv', 'sony-tv',
-                'android-tv', 'webos-tv'
-            ],
-            'Phone': [
-                'iphone-', 'galaxy-s', 'pixel-', 'oneplus-',
-                'huawei-p', 'xiaomi-mi'
-            ]
+        # Collect the indexes of all device types with a matching pattern
+        matched_indexes = {
+            int(match.lastgroup[1:])
+            for match in _OVERRIDE_HOSTNAME_RE.finditer(hostname_lower)
         }
+        if not matched_indexes:
+            return None
         
-        # Check for high-confidence hostname patterns
-        for device_type, patterns in high_confidence_patterns.items():
-            for pattern in patterns:
-                if pattern in hostname_lower:
-                    # Only override if it's different from current classification
-                    if device_type != current_device_type:
-                        # Additional validation based on Fingerbank confidence
-                        should_override = False
-                        
-                        # Always override if Fingerbank confidence is low (≤40)
-                        if fingerbank_result.confidence_score <= 40:
-                            should_override = True
-                            reason = f"low_confidence_{fingerbank_result.confidence_score}"
-                        
-                        # Override moderate confidence (41-60) for clear device type conflicts
-                        elif (fingerbank_result.confidence_score <= 60 and 
-                              self._is_clear_device_conflict(current_device_type, device_type)):
-                            should_override = True
-                            reason = f"device_conflict_{fingerbank_result.confidence_score}"
-                        
-                        # Override high confidence (61+) only for very specific cases
-                        elif (fingerbank_result.confidence_score > 60 and 
-                              self._is_critical_override_case(hostname_lower, current_device_type, device_type)):
-                            should_override = True
-                            reason = f"critical_override_{fingerbank_result.confidence_score}"
-                        
-                        if should_override:
-                            return {
-                                'device_type': device_type,
-                                'operating_system': self._infer_os_from_device_type(device_type, hostname_lower),
-                                'method': f'fingerbank_override_{reason}'
-                            }
+        # Every pattern of a type leads to the same decision, so check the
+        # matched types in declaration order
+        for type_index in sorted(matched_indexes):
+            device_type = _OVERRIDE_TYPES[type_index]
+            # Only override if it's different from current classification
+            if device_type != current_device_type:
+                # Additional validation based on Fingerbank confidence
+                should_override = False
+                
+                # Always override if Fingerbank confidence is low (≤40)
+                if fingerbank_result.confidence_score <= 40:
+                    should_override = True
+                    reason = f"low_confidence_{fingerbank_result.confidence_score}"
+                
+                # Override moderate confidence (41-60) for clear device type conflicts
+                elif (fingerbank_result.confidence_score <= 60 and 
+                      self._is_clear_device_conflict(current_device_type, device_type)):
+                    should_override = True
+                    reason = f"device_conflict_{fingerbank_result.confidence_score}"
+                
+                # Override high confidence (61+) only for very specific cases
+                elif (fingerbank_result.confidence_score > 60 and 
+                      hostname_features & _HOSTNAME_CRITICAL_OVERRIDE):
+                    should_override = True
+                    reason = f"critical_override_{fingerbank_result.confidence_score}"
+                
+                if should_override:
+                    return {
+                        'device_type': device_type,
+                        'operating_system': self._infer_os_from_device_type(device_type, hostname_lower),
+                        'method': sys.intern(f'fingerbank_override_{reason}')
+                    }
         
         return None
     
     def _is_clear_device_conflict(self, fingerbank_type: str, hostname_type: str) -> bool:
         """Check if there's a clear conflict between Fingerbank and hostname device types."""
-        # Define conflicting categories
-        device_categories = {
-            'mobile': ['Phone', 'Tablet'],
-            'computer': ['Computer', 'Laptop', 'Desktop'],
-            'smart_home': ['Smart Camera', 'Smart Speaker', 'Smart Thermostat', 'Smart TV'],
-            'entertainment': ['Gaming Console', 'Streaming Device', 'Smart TV'],
-            'network': ['Network Device', 'Router', 'Access Point'],
-            'iot': ['IoT Device', 'Smart Camera', 'Smart Speaker', 'Smart Thermostat']
-        }
-        
-        # Find categories for each type
-        fingerbank_category = None
-        hostname_category = None
-        
-        for category, types in device_categories.items():
-            if fingerbank_type in types:
-                fingerbank_category = category
-            if hostname_type in types:
-                hostname_category = category
+        fingerbank_category = _TYPE_TO_CATEGORY.get(fingerbank_type)
+        hostname_category = _TYPE_TO_CATEGORY.get(hostname_type)
         
         # Clear conflict if they're in different non-overlapping categories
-        if (fingerbank_category and hostname_category and 
-            fingerbank_category != hostname_category and
-            not self._categories_overlap(fingerbank_category, hostname_category)):
-            return True
-        
-        return False
+        return bool(fingerbank_category and hostname_category and 
+                    fingerbank_category != hostname_category and
+                    not self._categories_overlap(fingerbank_category, hostname_category))
     
     def _categories_overlap(self, cat1: str, cat2: str) -> bool:
         """Check if two device categories can overlap."""
-        overlapping_pairs = [
-            ('smart_home', 'iot'),
-            ('entertainment', 'smart_home'),
-            ('entertainment', 'iot')
-        ]
-        
-        return (cat1, cat2) in overlapping_pairs or (cat2, cat1) in overlapping_pairs
-    
-    def _is_critical_override_case(self, hostname_lower: str, fingerbank_type: str, hostname_type: str) -> bool:
-        """Check for critical cases where we should override even high-confidence Fingerbank results."""
-        # Very specific device identifiers that are unlikely to be wrong
-        critical_patterns = [
-            'ring-camera', 'ring-doorbell',  # Ring devices are always cameras
-            'ps4-console', 'ps5-console',     # PlayStation consoles
-            'xbox-one', 'xbox-series',        # Xbox consoles
-            'firetv-stick', 'roku-stick',     # Streaming devices
-            'nest-thermostat',                # Nest thermostats
-            'hp-printer', 'canon-printer'     # Specific printer models
-        ]
-        
-        for pattern in critical_patterns:
-            if pattern in hostname_lower:
-                return True
-        
-        return False
+        return frozenset((cat1, cat2)) in _OVERLAPPING_CATEGORIES
     
     def _infer_os_from_device_type(self, device_type: str, hostname_lower: str) -> str:
         """Infer operating system from device type and hostname patterns."""
-        os_mapping = {
-            'Smart Camera': 'Linux',
-            'Smart Speaker': 'Linux', 
-            'Smart Thermostat': 'Linux',
-            'Streaming Device': 'Android TV' if 'firetv' in hostname_lower else 'Linux',
-            'Gaming Console': 'PlayStation OS' if any(ps in hostname_lower for ps in ['ps4', 'ps5', 'playstation']) 
-                             else 'Xbox OS' if 'xbox' in hostname_lower 
-                             else 'Nintendo OS',
-            'Printer': 'Embedded OS',
-            'Smart TV': 'Android TV' if 'android' in hostname_lower else 'webOS' if 'lg' in hostname_lower else 'Tizen',
-            'Phone': 'iOS' if 'iphone' in hostname_lower else 'Android'
-        }
-        
-        return os_mapping.get(device_type, 'Unknown')
+        resolver = _OS_RESOLVERS.get(device_type)
+        return resolver(hostname_lower) if resolver else 'Unknown'
     
     def _calculate_overall_confidence(self, result: DeviceClassificationResult) -> str:
         """Calculate overall confidence based on available information and methods."""
-        confidence_score = 0
-        
-        # Vendor confidence
-        if result.vendor:
-            confidence_score += 20
-        
-        # Classification method confidence
-        if result.classification_method == "fingerbank" and result.fingerbank_confidence:
-            if result.fingerbank_confidence >= 80:
-                confidence_score += 60
-            elif result.fingerbank_confidence >= 60:
-                confidence_score += 40
-            else:
-                confidence_score += 20
-        elif result.classification_method == "hostname_specific":
-            confidence_score += 50
-        elif result.classification_method == "dhcp_fingerprint":
-            if result.dhcp_fingerprint_confidence == "high":
-                confidence_score += 40
-            elif result.dhcp_fingerprint_confidence == "medium":
-                confidence_score += 25
-            else:
-                confidence_score += 10
-        elif result.classification_method == "enhanced_fallback":
-            confidence_score += 15
-        
-        # Additional information bonus
-        if result.hostname:
-            confidence_score += 10
-        if result.vendor_class:
-            confidence_score += 10
-        
-        # Convert to categorical confidence
-        if confidence_score >= 80:
-            return "high"
-        elif confidence_score >= 50:
-            return "medium"
-        elif confidence_score >= 30:
-            return "low"
-        else:
-            return "unknown"
+        method = result.classification_method
+        # Only the inputs the scoring for this method reads go into the cache key
+        return _overall_confidence(
+            bool(result.vendor),
+            method,
+            _fingerbank_confidence_tier(result.fingerbank_confidence) if method == "fingerbank" else 0,
+            result.dhcp_fingerprint_confidence if method == "dhcp_fingerprint" else None,
+            bool(result.hostname),
+            bool(result.vendor_class),
+        )
     
     def export_results(self, results: List[DeviceClassificationResult], output_file: str = None):
         """Export classification results to JSON file."""
@@ -699,34 +938,27 @@ class OptimizedDHCPDeviceAnalyzer:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"results_{timestamp}.json"
         
-        export_data = {
+        metadata = {
             'timestamp': datetime.now().isoformat(),
             'total_devices': len(results),
             'classification_stats': self.classification_stats,
-            'devices': [
-                {
-                    'mac_address': r.mac_address,
-                    'ip_address': r.ip_address,
-                    'hostname': r.hostname,
-                    'vendor': r.vendor,
-                    'device_type': r.device_type,
-                    'device_name': r.device_name,
-                    'operating_system': r.operating_system,
-                    'classification': r.classification,
-                    'classification_method': r.classification_method,
-                    'overall_confidence': r.overall_confidence,
-                    'fingerbank_confidence': r.fingerbank_confidence,
-                    'dhcp_fingerprint_confidence': r.dhcp_fingerprint_confidence,
-                    'fingerbank_error': r.fingerbank_error,
-                    'dhcp_fingerprint': r.dhcp_fingerprint,
-                    'vendor_class': r.vendor_class
-                }
-                for r in results
-            ]
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
+        # Write one device at a time instead of building the whole document;
+        # the layout matches json.dump(indent=2) of the complete object
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write('{\n')
+            for key, value in metadata.items():
+                f.write('  ' + _to_indented_json(key) + ': ')
+                f.write(_to_indented_json(value).replace('\n', '\n  ') + ',\n')
+            f.write('  "devices": [')
+            separator = '\n    '
+            for r in results:
+                device = dict(zip(_EXPORT_FIELDS, _get_export_values(r)))
+                f.write(separator)
+                f.write(_to_indented_json(device).replace('\n', '\n    '))
+                separator = ',\n    '
+            f.write('\n  ]\n}' if results else ']\n}')
         
         logger.info(f"Results exported to {output_file}")
         return output_file
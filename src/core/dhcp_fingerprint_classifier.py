@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+DHCP fingerprint classification based on option counts and vendor keywords.
+Kept separate from the analyzer so it can be used without the Fingerbank client.
+"""
+
+import re
+from typing import Optional
+
+# Vendor and vendor class keywords used by the fingerprint classifier
+_IOT_VENDOR_RE = re.compile('espressif|murata', re.IGNORECASE)
+_GAMING_VENDOR_CLASS_RE = re.compile('ps5|nintendo|xbox', re.IGNORECASE)
+_STREAMING_VENDOR_CLASS_RE = re.compile('roku|fire tv|chromecast', re.IGNORECASE)
+_SMART_HOME_VENDOR_CLASS_RE = re.compile('ring|nest|hue', re.IGNORECASE)
+_MOBILE_VENDOR_RE = re.compile('apple|samsung|google|huawei', re.IGNORECASE)
+_COMPUTER_VENDOR_CLASS_RE = re.compile('windows|microsoft|dhcpcd|linux', re.IGNORECASE)
+
+# Leading vendor names answered by a set probe before the substring regexes
+_IOT_VENDORS = frozenset(('espressif', 'murata'))
+_MOBILE_VENDORS = frozenset(('apple', 'samsung', 'google', 'huawei'))
+
+
+def _vendor_first_word(vendor: str) -> str:
+    """Return the lowercased first word of a vendor name, e.g. 'apple' for 'Apple, Inc.'."""
+    return vendor.partition(' ')[0].rstrip(',.').lower()
+
+
+class DHCPFingerprintClassifier:
+    """DHCP fingerprint-based device classification."""
+    
+    def __init__(self):
+        """Initialize the DHCP fingerprint classifier."""
+        # Handler per option count: 1-3 IoT, 4-6 smart home, 7-9 mobile,
+        # 10+ complex (the last slot covers every larger count)
+        self._dispatch = (
+            (None,) +
+            (self._classify_minimal_device,) * 3 +
+            (self._classify_smart_device,) * 3 +
+            (self._classify_mobile_device,) * 3 +
+            (self._classify_complex_device,)
+        )
+    
+    def classify_by_fingerprint(self, fingerprint: str, vendor: str = None, 
+                              vendor_class: str = None, hostname: str = None) -> tuple[Optional[str], str]:
+        """Classify device based on DHCP fingerprint pattern."""
+        if not fingerprint:
+            return None, "none"
+        
+        # Only the number of options drives the dispatch, so count separators
+        # instead of allocating the split list
+        option_count = fingerprint.count(',') + 1
+        
+        handler = self._dispatch[min(option_count, len(self._dispatch) - 1)]
+        return handler(vendor, vendor_class)
+    
+    def _classify_minimal_device(self, vendor: str = None, vendor_class: str = None) -> tuple[str, str]:
+        """Classify devices with very minimal DHCP options (IoT)."""
+        if vendor:
+            if _vendor_first_word(vendor) in _IOT_VENDORS or _IOT_VENDOR_RE.search(vendor):
+                return 'IoT Device', 'medium'
+            elif 'philips' in vendor.lower():
+                return 'Smart Lighting', 'medium'
+        return 'IoT Device', 'low'
+    
+    def _classify_smart_device(self, vendor: str = None, 
+                             vendor_class: str = None) -> tuple[Optional[str], str]:
+        """Classify smart home/IoT devices with 4-6 options."""
+        if vendor_class:
+            if _GAMING_VENDOR_CLASS_RE.search(vendor_class):
+                return 'Gaming Console', 'high'
+            elif _STREAMING_VENDOR_CLASS_RE.search(vendor_class):
+                return 'Streaming Device', 'high'
+            elif _SMART_HOME_VENDOR_CLASS_RE.search(vendor_class):
+                return 'Smart Home Device', 'high'
+        
+        if vendor:
+            vendor_lower = vendor.lower()
+            if 'amazon' in vendor_lower:
+                return 'Smart Speaker', 'medium'
+            elif 'philips' in vendor_lower:
+                return 'Smart Lighting', 'medium'
+            elif 'nintendo' in vendor_lower:
+                return 'Gaming Console', 'high'
+        
+        return 'Smart Home Device', 'low'
+    
+    def _classify_mobile_device(self, vendor: str = None, vendor_class: str = None) -> tuple[str, str]:
+        """Classify mobile devices with 7-9 options."""
+        if vendor and (_vendor_first_word(vendor) in _MOBILE_VENDORS or
+                       _MOBILE_VENDOR_RE.search(vendor)):
+            return 'Phone', 'high'
+        return 'Phone', 'medium'
+    
+    def _classify_complex_device(self, vendor: str = None, vendor_class: str = None) -> tuple[str, str]:
+        """Classify complex devices with 10+ options (typically computers)."""
+        # Windows (windows/microsoft) and Linux (dhcpcd/linux) clients
+        if vendor_class and _COMPUTER_VENDOR_CLASS_RE.search(vendor_class):
+            return 'Computer', 'high'
+        return 'Computer', 'medium'
@@ -5,19 +5,180 @@ Replaces packet capture with log file parsing approach.
 Supports various DHCP log formats from different systems.
 """
 
+import os
 import re
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Union, TextIO
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Tuple, Union, TextIO
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import re2  # Optional: linear-time engine for log format patterns
+except ImportError:
+    re2 = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Literal substrings each log format's regex requires; a line missing any of
+# them cannot match that format, so its regex search is skipped
+_LOG_FORMAT_MARKERS = {
+    'isc_dhcp': ('dhcpd', 'DHCP'),
+    'isc_dhcp_enhanced': ('dhcpd:', 'DHCP'),
+    'windows_dhcp': (',',),
+    'pfsense_dhcp': ('dhcpd:',),
+    'home_router_dhcp': ('dhcp:', 'DHCP-', 'MAC'),
+    'routeros_dhcp': ('dhcp,info', 'assigned'),
+    'routeros_assigned': ('RouterOS', 'assigned'),
+    'generic_assigned': ('dhcp', 'assigned'),
+    'xfinity_gateway': ('kernel:',),
+    'test_home_network': ('dhcp:', 'DHCP-', 'for MAC', 'requesting'),
+}
+
+class FormatMatch(Protocol):
+    """Match object returned by a FormatPattern (re.Match or an RE2 match)."""
+    
+    def groupdict(self) -> Dict[str, Optional[str]]: ...
+
+class FormatPattern(Protocol):
+    """Compiled log format regex: re.Pattern, or an RE2 regexp when re2 is installed."""
+    
+    @property
+    def pattern(self) -> str: ...
+    
+    def match(self, string: str) -> Optional[FormatMatch]: ...
+    
+    def search(self, string: str) -> Optional[FormatMatch]: ...
+
+def _compile_format_pattern(pattern: str) -> FormatPattern:
+    """Compile a log format regex with RE2 when installed, falling back to re."""
+    # RE2's \d and \s are ASCII-only, which is all DHCP log lines use
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception as e:
+            logger.debug(f"RE2 cannot compile log pattern, using re: {e}")
+    return re.compile(pattern)
+
+# Content below this size is parsed serially; larger content is split into
+# chunks of roughly this many characters for worker processes
+PARALLEL_PARSE_CHUNK_SIZE = 1 << 20
+
+# Common timestamp formats
+_TIMESTAMP_FORMATS = (
+    '%b %d %H:%M:%S',  # Dec 25 14:30:45
+    '%m/%d/%y %H:%M:%S',  # 12/25/23 14:30:45
+    '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45
+    '%b %d %Y %H:%M:%S',  # Dec 25 2023 14:30:45
+)
+
+
+@lru_cache(maxsize=4096)
+def _strptime_first_format(timestamp_str: str) -> Optional[datetime]:
+    """Parse a timestamp with the first matching format; repeated strings hit the cache."""
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# MAC address already in the aa:bb:cc:dd:ee:ff form the parser produces
+_CANONICAL_MAC_RE = re.compile(r'[0-9a-f]{2}(?::[0-9a-f]{2}){5}')
+
+# DHCP option extraction patterns, compiled once at import
+_HOSTNAME_PAREN_RE = re.compile(r'\(([^)]+)\)')
+_DHCP_OPTIONS_RE = re.compile(r'DHCP-OPTIONS:\s*(.+)')
+
+# One token of the DHCP-OPTIONS format: 55=[1,3,6,15], 60="value", 51=86400.
+# The lookbehind keeps "51=" from also reading as option 1, and list values
+# stop before the next "id=" token.
+_DHCP_OPTION_TOKEN_RE = re.compile(
+    r'(?<![0-9])(?P<id>[0-9]+)='
+    r'(?:"(?P<quoted>[^"]+)"'
+    r'|\[(?P<list>[0-9,\s]+)\]'
+    r'|(?P<value>[0-9.]+(?:,\s*(?![0-9.]+=)[0-9.]+)*))'
+)
+
+# Option id -> (option name, value form) for the options we extract
+_DHCP_OPTION_FORMS = {
+    # Core fingerprinting options
+    '55': ('option_55', 'list'),          # Parameter Request List (critical)
+    '60': ('option_60', 'quoted'),        # Vendor Class Identifier (critical)
+    '12': ('option_12', 'quoted'),        # Hostname
+    '81': ('option_81', 'quoted'),        # Client FQDN
+    
+    # Additional fingerprinting options
+    '77': ('option_77', 'quoted'),        # User Class (Windows domain info)
+    '93': ('option_93', 'number'),        # Client System Architecture
+    '125': ('option_125', 'quoted'),      # Vendor-Identified Vendor Class
+    '1': ('option_1', 'address'),         # Subnet Mask
+    '3': ('option_3', 'address'),         # Router/Gateway
+    '6': ('option_6', 'addresses'),       # DNS Servers
+    '15': ('option_15', 'quoted'),        # Domain Name
+    '28': ('option_28', 'address'),       # Broadcast Address
+    '51': ('option_51', 'number'),        # IP Address Lease Time
+    '58': ('option_58', 'number'),        # Renewal Time
+    '59': ('option_59', 'number'),        # Rebinding Time
+    '42': ('option_42', 'addresses'),     # NTP Servers
+    '119': ('option_119', 'addresses'),   # Domain Search
+    '255': ('option_255', 'number'),      # End
+    
+    # Vendor-specific options
+    '43': ('option_43', 'quoted'),        # Vendor-Specific Information
+    '249': ('option_249', 'quoted'),      # Microsoft Classless Static Routes
+    '252': ('option_252', 'quoted'),      # Web Proxy Auto-Discovery
+}
+
+# Fallback patterns for options logged outside the DHCP-OPTIONS format
+_FALLBACK_OPTION_PATTERNS = tuple(
+    (option_name, tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns))
+    for option_name, patterns in (
+        ('option_60', (
+            r'vendor[_-]class[:\s]+"([^"]+)"',
+            r'vendor[_-]class[:\s]+([^\s,;]+)',
+            r'VCI[:\s]+"([^"]+)"',
+            r'VCI[:\s]+([^\s,;]+)',
+        )),
+        ('option_55', (
+            r'param[_-]req[_-]list[:\s]+([0-9,\s]+)',
+            r'PRL[:\s]+([0-9,\s]+)',
+            r'parameter[_-]request[:\s]+([0-9,\s]+)',
+        )),
+        ('option_77', (
+            r'user[_-]class[:\s]+"([^"]+)"',
+            r'user[_-]class[:\s]+([^\s,;]+)',
+        )),
+        ('option_12', (
+            r'hostname[:\s]+"([^"]+)"',
+            r'hostname[:\s]+([^\s,;]+)',
+        )),
+    )
+)
+
+# Every fallback pattern contains one of these keywords (same case folding),
+# so lines without any of them can skip the fallback patterns entirely
+_FALLBACK_OPTION_PROBE_RE = re.compile(r'vendor|vci|param|prl|user|hostname', re.IGNORECASE)
+
+_DHCPV6_OPTIONS_RE = re.compile(r'DHCPv6[_-]OPTIONS:\s*(.+)', re.IGNORECASE)
+_DHCPV6_OPTION_PATTERNS = (
+    ('dhcpv6_fingerprint', re.compile(r'fingerprint=\[([0-9,\s]+)\]')),
+    ('dhcpv6_enterprise', re.compile(r'enterprise=([0-9]+)')),
+)
+
+# Windows-specific patterns, tried when the line mentions MSFT/Microsoft
+_WINDOWS_OPTION_PATTERNS = (
+    ('option_77', re.compile(r'domain[:\s]+([^\s,;]+)', re.IGNORECASE)),
+    ('option_249', re.compile(r'classless[_-]route[:\s]+([^\s,;]+)', re.IGNORECASE)),
+)
+
+@dataclass(slots=True)
 class DHCPLogEntry:
     """Enhanced DHCP log entry information for maximum Fingerbank accuracy."""
     mac_address: str
@@ -39,8 +200,8 @@ class DHCPLogEntry:
     dhcp6_fingerprint: Optional[str] = None
     dhcp6_enterprise: Optional[str] = None
     
-    # All extracted options
-    dhcp_options: Dict = None
+    # All extracted options (None when the line carried none)
+    dhcp_options: Optional[Dict] = None
     
     # Log metadata
     message_type: Optional[str] = None
@@ -53,6 +214,16 @@ class DHCPLogParser:
     Supports multiple log formats and extracts device fingerprinting information.
     """
     
+    # Message type for the action strings the built-in log formats produce
+    _ACTION_MAP = {
+        'DHCPACK': 'ACK', 'ACK': 'ACK',
+        'DHCPREQUEST': 'REQUEST', 'REQUEST': 'REQUEST',
+        'DHCPOFFER': 'OFFER', 'OFFER': 'OFFER',
+        'DHCPDISCOVER': 'DISCOVER', 'DISCOVER': 'DISCOVER',
+    }
+    # Substring fallback for free-form actions, in precedence order
+    _ACTION_KEYWORDS = ('ACK', 'REQUEST', 'OFFER', 'DISCOVER')
+    
     def __init__(self):
         """Initialize the DHCP log parser."""
         self.parsed_count = 0
@@ -61,18 +232,22 @@ class DHCPLogParser:
         
         # Compiled regex patterns for different log formats
         self.log_patterns = self._compile_log_patterns()
+        self._format_checks = [
+            (format_name, pattern, _LOG_FORMAT_MARKERS.get(format_name, ()))
+            for format_name, pattern in self.log_patterns.items()
+        ]
         
         # OUI-based vendor class mapping for improved Fingerbank accuracy
         self.oui_vendor_class_map = self._build_oui_vendor_class_map()
         
         logger.info("DHCP Log Parser initialized")
     
-    def _compile_log_patterns(self) -> Dict[str, re.Pattern]:
+    def _compile_log_patterns(self) -> Dict[str, FormatPattern]:
         """Compile regex patterns for different DHCP log formats."""
         patterns = {}
         
         # ISC DHCP Server log format (standard)
-        patterns['isc_dhcp'] = re.compile(
+        patterns['isc_dhcp'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<hostname>\S+)\s+dhcpd(?:\\[\d+\\])?\s*:\s+'
             r'(?P<action>DHCPACK|DHCPREQUEST|DHCPOFFER|DHCPDISCOVER)\s+'
@@ -87,7 +262,7 @@ class DHCPLogParser:
         )
         
         # Enhanced ISC DHCP format with DHCP options (our test format)
-        patterns['isc_dhcp_enhanced'] = re.compile(
+        patterns['isc_dhcp_enhanced'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'dhcpd:\s+'
             r'(?P<action>DHCPACK|DHCPREQUEST|DHCPOFFER|DHCPDISCOVER)\s+'
@@ -102,7 +277,7 @@ class DHCPLogParser:
         )
         
         # Windows DHCP Server log format
-        patterns['windows_dhcp'] = re.compile(
+        patterns['windows_dhcp'] = _compile_format_pattern(
             r'(?P<id>\d+),(?P<date>\d+/\d+/\d+),(?P<time>\d+:\d+:\d+),'
             r'(?P<action>[\w\s]+),'
             r'(?P<ip>\d+\.\d+\.\d+\.\d+),'
@@ -111,7 +286,7 @@ class DHCPLogParser:
         )
         
         # pfSense DHCP log format (ISC DHCP variant)
-        patterns['pfsense_dhcp'] = re.compile(
+        patterns['pfsense_dhcp'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<hostname>\S+)\s+dhcpd:\s+'
             r'(?P<action>\w+)\s+'
@@ -124,7 +299,7 @@ class DHCPLogParser:
         )
         
         # Home router DHCP log format (Netgear, Linksys, D-Link, etc.) - FIXED
-        patterns['home_router_dhcp'] = re.compile(
+        patterns['home_router_dhcp'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<source_ip>\d+\.\d+\.\d+\.\d+)\s+'
             r'dhcp:\s+'
@@ -140,7 +315,7 @@ class DHCPLogParser:
         )
         
         # RouterOS/MikroTik DHCP log format
-        patterns['routeros_dhcp'] = re.compile(
+        patterns['routeros_dhcp'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+:\d+:\d+)\s+'
             r'dhcp,info\s+'
             r'(?P<interface>\S+)\s+'
@@ -149,7 +324,7 @@ class DHCPLogParser:
         )
         
         # RouterOS simple assignment format (for mixed logs) - IMPROVED
-        patterns['routeros_assigned'] = re.compile(
+        patterns['routeros_assigned'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'RouterOS\s+assigned\s+'
             r'(?P<ip>\d+\.\d+\.\d+\.\d+)\s+'
@@ -157,7 +332,7 @@ class DHCPLogParser:
         )
         
         # Generic DHCP assignment format (for mixed logs and simple routers) - NEW IMPROVED
-        patterns['generic_assigned'] = re.compile(
+        patterns['generic_assigned'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<source>[\d\.]+)\s+'
             r'dhcp\s+assigned\s+'
@@ -167,7 +342,7 @@ class DHCPLogParser:
         )
         
         # Xfinity Gateway DHCP log format
-        patterns['xfinity_gateway'] = re.compile(
+        patterns['xfinity_gateway'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<hostname>\S+)\s+kernel:\s+\\[DHCP\\]\s+'
             r'(?P<action>DISCOVER|OFFER|REQUEST|ACK)\s+'
@@ -181,7 +356,7 @@ class DHCPLogParser:
         )
         
         # Test log format (realistic home network)
-        patterns['test_home_network'] = re.compile(
+        patterns['test_home_network'] = _compile_format_pattern(
             r'(?P<timestamp>\S+\s+\d+\s+\d+:\d+:\d+)\s+'
             r'(?P<source_ip>\d+\.\d+\.\d+\.\d+)\s+'
             r'dhcp:\s+DHCP-(?P<action>ACK|REQUEST|DISCOVER|OFFER)\s+'
@@ -262,8 +437,13 @@ class DHCPLogParser:
         if not mac_address:
             return None
         
+        # Most logs already use colon-separated MACs, which only need lowercasing
+        mac_lower = mac_address.lower()
+        if len(mac_lower) == 17 and _CANONICAL_MAC_RE.fullmatch(mac_lower):
+            return mac_lower
+        
         # Remove all non-hex characters
-        clean_mac = re.sub(r'[^0-9a-fA-F]', '', mac_address.lower())
+        clean_mac = re.sub(r'[^0-9a-fA-F]', '', mac_lower)
         
         # Ensure we have 12 hex characters
         if len(clean_mac) != 12:
@@ -277,7 +457,8 @@ class DHCPLogParser:
     def _decode_hex_option(self, hex_string: str) -> str:
         """Decode a hex-encoded DHCP option string."""
         try:
-            return bytes.fromhex(hex_string.replace(":", "")).decode('utf-8', errors='ignore')
+            hex_digits = hex_string.replace(":", "") if ":" in hex_string else hex_string
+            return bytes.fromhex(hex_digits).decode('utf-8', errors='ignore')
         except (ValueError, TypeError):
             return hex_string
     
@@ -286,156 +467,106 @@ class DHCPLogParser:
         if not timestamp_str:
             return datetime.now()
         
-        # Common timestamp formats
-        timestamp_formats = [
-            '%b %d %H:%M:%S',  # Dec 25 14:30:45
-            '%m/%d/%y %H:%M:%S',  # 12/25/23 14:30:45
-            '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45
-            '%b %d %Y %H:%M:%S',  # Dec 25 2023 14:30:45
-        ]
-        
-        for fmt in timestamp_formats:
-            try:
-                parsed_time = datetime.strptime(timestamp_str.strip(), fmt)
-                # If no year in format, assume current year
-                if parsed_time.year == 1900:
-                    parsed_time = parsed_time.replace(year=datetime.now().year)
-                return parsed_time
-            except ValueError:
-                continue
+        parsed_time = _strptime_first_format(timestamp_str.strip())
+        if parsed_time is None:
+            logger.warning(f"Could not parse timestamp: {timestamp_str}")
+            return datetime.now()
         
-        logger.warning(f"Could not parse timestamp: {timestamp_str}")
-        return datetime.now()
+        # If no year in format, assume current year
+        if parsed_time.year == 1900:
+            parsed_time = parsed_time.replace(year=datetime.now().year)
+        return parsed_time
     
     def _extract_dhcp_options(self, log_line: str) -> Dict:
         """Enhanced DHCP options extraction for maximum Fingerbank accuracy."""
         options = {}
         
         # Look for hostname in parentheses
-        hostname_match = re.search(r'\(([^)]+)\)', log_line)
+        hostname_match = _HOSTNAME_PAREN_RE.search(log_line)
         if hostname_match:
             options['option_12'] = hostname_match.group(1)
         
         # Enhanced DHCP-OPTIONS format parsing: 55=[1,3,6,15], 60="value", 12="value"
-        dhcp_options_match = re.search(r'DHCP-OPTIONS:\s*(.+)', log_line)
+        dhcp_options_match = _DHCP_OPTIONS_RE.search(log_line)
         if dhcp_options_match:
             options_string = dhcp_options_match.group(1)
             
-            # Critical options for Fingerbank accuracy
-            option_patterns = {
-                # Core fingerprinting options
-                'option_55': r'55=\[([0-9,\s]+)\]',  # Parameter Request List (critical) - fixed regex
-                'option_60': r'60="([^"]+)"',          # Vendor Class Identifier (critical)
-                'option_12': r'12="([^"]+)"',          # Hostname
-                'option_81': r'81="([^"]+)"',          # Client FQDN
-                
-                # Additional fingerprinting options
-                'option_77': r'77="([^"]+)"',          # User Class (Windows domain info)
-                'option_93': r'93=([0-9]+)',           # Client System Architecture
-                'option_125': r'125="([^"]+)"',        # Vendor-Identified Vendor Class
-                'option_1': r'1=([0-9\.]+)',           # Subnet Mask
-                'option_3': r'3=([0-9\.]+)',           # Router/Gateway
-                'option_6': r'6=([0-9\.,\s]+)',        # DNS Servers
-                'option_15': r'15="([^"]+)"',          # Domain Name
-                'option_28': r'28=([0-9\.]+)',         # Broadcast Address
-                'option_51': r'51=([0-9]+)',           # IP Address Lease Time
-                'option_58': r'58=([0-9]+)',           # Renewal Time
-                'option_59': r'59=([0-9]+)',           # Rebinding Time
-                'option_42': r'42=([0-9\.,\s]+)',      # NTP Servers
-                'option_119': r'119=([0-9,\s]+)',      # Domain Search
-                'option_255': r'255=([0-9]+)',         # End
-                
-                # Vendor-specific options
-                'option_43': r'43="([^"]+)"',          # Vendor-Specific Information
-                'option_249': r'249="([^"]+)"',        # Microsoft Classless Static Routes
-                'option_252': r'252="([^"]+)"',        # Web Proxy Auto-Discovery
-            }
-            
-            for option_name, pattern in option_patterns.items():
-                match = re.search(pattern, options_string)
-                if match:
-                    value = match.group(1)
-                    # Clean up parameter request list
-                    if option_name == 'option_55':
-                        value = value.replace(' ', '')
-                    if option_name == 'option_43':
-                        value = self._decode_hex_option(value)
-                    options[option_name] = value
-        
-        # Enhanced fallback patterns for various log formats
-        fallback_patterns = {
-            'option_60': [
-                r'vendor[_-]class[:\s]+"([^"]+)"',
-                r'vendor[_-]class[:\s]+([^\s,;]+)',
-                r'VCI[:\s]+"([^"]+)"',
-                r'VCI[:\s]+([^\s,;]+)',
-            ],
-            'option_55': [
-                r'param[_-]req[_-]list[:\s]+([0-9,\s]+)',
-                r'PRL[:\s]+([0-9,\s]+)',
-                r'parameter[_-]request[:\s]+([0-9,\s]+)',
-            ],
-            'option_77': [
-                r'user[_-]class[:\s]+"([^"]+)"',
-                r'user[_-]class[:\s]+([^\s,;]+)',
-            ],
-            'option_12': [
-                r'hostname[:\s]+"([^"]+)"',
-                r'hostname[:\s]+([^\s,;]+)',
-            ]
-        }
+            options.update(self._parse_dhcp_options_payload(options_string))
         
         # Apply fallback patterns for missing options
-        for option_name, patterns in fallback_patterns.items():
-            if option_name not in options:
-                for pattern in patterns:
-                    match = re.search(pattern, log_line, re.IGNORECASE)
-                    if match:
-                        value = match.group(1)
-                        if option_name == 'option_55':
-                            value = value.replace(' ', '')
-                        options[option_name] = value
-                        break
+        if _FALLBACK_OPTION_PROBE_RE.search(log_line):
+            for option_name, patterns in _FALLBACK_OPTION_PATTERNS:
+                if option_name not in options:
+                    for pattern in patterns:
+                        match = pattern.search(log_line)
+                        if match:
+                            value = match.group(1)
+                            if option_name == 'option_55':
+                                value = value.replace(' ', '')
+                            options[option_name] = value
+                            break
         
         # Extract DHCPv6 options if present
-        dhcpv6_match = re.search(r'DHCPv6[_-]OPTIONS:\s*(.+)', log_line, re.IGNORECASE)
+        dhcpv6_match = _DHCPV6_OPTIONS_RE.search(log_line)
         if dhcpv6_match:
             dhcpv6_string = dhcpv6_match.group(1)
-            # DHCPv6 fingerprint patterns
-            dhcpv6_patterns = {
-                'dhcpv6_fingerprint': r'fingerprint=\\[([0-9,\s]+)\\]',
-                'dhcpv6_enterprise': r'enterprise=([0-9]+)',
-            }
             
-            for option_name, pattern in dhcpv6_patterns.items():
-                match = re.search(pattern, dhcpv6_string)
+            for option_name, pattern in _DHCPV6_OPTION_PATTERNS:
+                match = pattern.search(dhcpv6_string)
                 if match:
                     options[option_name] = match.group(1).replace(' ', '')
         
         # Windows-specific option extraction
         if 'MSFT' in log_line or 'Microsoft' in log_line:
-            # Look for Windows-specific patterns
-            windows_patterns = {
-                'option_77': r'domain[:\s]+([^\s,;]+)',
-                'option_249': r'classless[_-]route[:\s]+([^\s,;]+)',
-            }
-            
-            for option_name, pattern in windows_patterns.items():
+            for option_name, pattern in _WINDOWS_OPTION_PATTERNS:
                 if option_name not in options:
-                    match = re.search(pattern, log_line, re.IGNORECASE)
+                    match = pattern.search(log_line)
                     if match:
                         options[option_name] = match.group(1)
         
         return options
     
+    def _parse_dhcp_options_payload(self, options_string: str) -> Dict:
+        """Tokenize a DHCP-OPTIONS payload in one pass, keeping the first value of each option."""
+        parsed = {}
+        for match in _DHCP_OPTION_TOKEN_RE.finditer(options_string):
+            option = _DHCP_OPTION_FORMS.get(match.group('id'))
+            if option is None or option[0] in parsed:
+                continue
+            
+            option_name, form = option
+            if form == 'quoted':
+                value = match.group('quoted')
+            elif form == 'list':
+                value = match.group('list')
+                # Clean up parameter request list
+                if value is not None:
+                    value = value.replace(' ', '')
+            else:
+                value = match.group('value')
+                if value is not None and form != 'addresses':
+                    value = value.split(',', 1)[0]
+                    if form == 'number' and not value.isdigit():
+                        value = None
+            
+            if value is None:
+                continue
+            if option_name == 'option_43':
+                value = self._decode_hex_option(value)
+            parsed[option_name] = value
+        
+        return parsed
+    
     def _parse_log_line(self, line: str) -> Optional[DHCPLogEntry]:
         """Parse a single log line and extract DHCP information."""
         line = line.strip()
         if not line or line.startswith('#'):
             return None
         
-        # Try each log format pattern
-        for format_name, pattern in self.log_patterns.items():
+        # Try each log format pattern whose required markers are present
+        for format_name, pattern, markers in self._format_checks:
+            if not all(marker in line for marker in markers):
+                continue
             match = pattern.search(line)
             if match:
                 groups = match.groupdict()
@@ -456,8 +587,8 @@ class DHCPLogParser:
                 )
                 
                 # Allow DISCOVER messages to not have an IP address
-                action = groups.get('action', '')
-                if not ip_address and 'DISCOVER' not in action.upper():
+                action = (groups.get('action') or '').upper()
+                if not ip_address and 'DISCOVER' not in action:
                     continue
                 
                 # Extract timestamp
@@ -472,17 +603,12 @@ class DHCPLogParser:
                     hostname = None
                 
                 # Extract message type/action
-                action = groups.get('action', '')
-                if 'ACK' in action.upper():
-                    message_type = 'ACK'
-                elif 'REQUEST' in action.upper():
-                    message_type = 'REQUEST'
-                elif 'OFFER' in action.upper():
-                    message_type = 'OFFER'
-                elif 'DISCOVER' in action.upper():
-                    message_type = 'DISCOVER'
-                else:
-                    message_type = 'LEASE'  # Generic lease assignment
+                message_type = self._ACTION_MAP.get(action)
+                if message_type is None:
+                    message_type = next(
+                        (keyword for keyword in self._ACTION_KEYWORDS if keyword in action),
+                        'LEASE'  # Generic lease assignment
+                    )
                 
                 # Extract DHCP options from the full log line
                 dhcp_options = self._extract_dhcp_options(line)
@@ -490,15 +616,16 @@ class DHCPLogParser:
                     dhcp_options['option_12'] = hostname
                 
                 # DIAGNOSTIC LOG: DHCP data quality assessment
-                logger.debug(f"DIAGNOSTIC [{mac_address}]: DHCP log parsing:")
-                logger.debug(f"  - Raw log line: {line[:100]}...")
-                logger.debug(f"  - Extracted hostname: {hostname}")
-                logger.debug(f"  - DHCP options found: {len(dhcp_options)}")
-                logger.debug(f"  - Key options: {list(dhcp_options.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"DIAGNOSTIC [{mac_address}]: DHCP log parsing:")
+                    logger.debug(f"  - Raw log line: {line[:100]}...")
+                    logger.debug(f"  - Extracted hostname: {hostname}")
+                    logger.debug(f"  - DHCP options found: {len(dhcp_options)}")
+                    logger.debug(f"  - Key options: {list(dhcp_options.keys())}")
                 if not dhcp_options.get('option_55'):
-                    logger.warning(f"DIAGNOSTIC [{mac_address}]: Missing DHCP fingerprint (option 55) - primary Fingerbank signal")
+                    logger.warning("DIAGNOSTIC [%s]: Missing DHCP fingerprint (option 55) - primary Fingerbank signal", mac_address)
                 if not dhcp_options.get('option_60'):
-                    logger.warning(f"DIAGNOSTIC [{mac_address}]: Missing vendor class (option 60) - secondary Fingerbank signal")
+                    logger.warning("DIAGNOSTIC [%s]: Missing vendor class (option 60) - secondary Fingerbank signal", mac_address)
                 
                 # Extract enhanced DHCP fingerprint data for Fingerbank
                 dhcp_fingerprint = dhcp_options.get('option_55')  # Parameter Request List (critical)
@@ -518,9 +645,9 @@ class DHCPLogParser:
                 if vendor_class: data_quality_score += 40
                 if dhcp_fingerprint: data_quality_score += 30
                 
-                logger.debug(f"DIAGNOSTIC [{mac_address}]: Data quality score: {data_quality_score}/100")
+                logger.debug("DIAGNOSTIC [%s]: Data quality score: %d/100", mac_address, data_quality_score)
                 if data_quality_score < 50:
-                    logger.warning(f"DIAGNOSTIC [{mac_address}]: Low data quality - expect reduced classification accuracy")
+                    logger.warning("DIAGNOSTIC [%s]: Low data quality - expect reduced classification accuracy", mac_address)
                 
                 user_class = dhcp_options.get('option_77')  # User Class (Windows domain)
                 client_arch = dhcp_options.get('option_93')  # Client Architecture
@@ -534,7 +661,7 @@ class DHCPLogParser:
                     ip_address=ip_address or "0.0.0.0",  # Use placeholder for DISCOVER messages
                     hostname=hostname,
                     vendor_class=vendor_class,
-                    dhcp_options=dhcp_options,
+                    dhcp_options=dhcp_options or None,
                     dhcp_fingerprint=dhcp_fingerprint,
                     client_fqdn=client_fqdn,
                     # Enhanced fields for Fingerbank
@@ -551,44 +678,55 @@ class DHCPLogParser:
         
         # If no pattern matched, log as skipped
         self.skipped_count += 1
-        logger.warning(f"DIAGNOSTIC: Failed to parse log line - no pattern matched: {line[:100]}...")
+        logger.warning("DIAGNOSTIC: Failed to parse log line - no pattern matched: %.100s...", line)
         return None
     
     def parse_log_content(self, log_content: str) -> List[DHCPLogEntry]:
         """Parse DHCP log content and return list of entries."""
         logger.info("Parsing DHCP log content")
         
-        entries = []
         lines = log_content.strip().split('\n')
+        return list(self.parse_log_iter(lines))
+    
+    def parse_log_iter(self, lines: Iterable[str]) -> Iterator[DHCPLogEntry]:
+        """Parse log lines one at a time, yielding each DHCP entry found."""
+        entry_count = 0
+        line_num = 0
         
         for line_num, line in enumerate(lines, 1):
             try:
                 entry = self._parse_log_line(line)
                 if entry:
-                    entries.append(entry)
+                    entry_count += 1
                     self.parsed_count += 1
-                    logger.debug(f"Parsed line {line_num}: {entry.mac_address} -> {entry.ip_address}")
+                    logger.debug("Parsed line %d: %s -> %s", line_num, entry.mac_address, entry.ip_address)
+                    yield entry
             except Exception as e:
                 self.error_count += 1
                 logger.error(f"Error parsing line {line_num}: {e}")
         
-        logger.info(f"Parsed {len(entries)} DHCP entries from {len(lines)} log lines")
-        return entries
+        logger.info(f"Parsed {entry_count} DHCP entries from {line_num} log lines")
     
     def parse_log_file(self, file_path: Union[str, Path]) -> List[DHCPLogEntry]:
         """Parse DHCP log file and return list of entries."""
+        # Lines are streamed from the file rather than read into one string
+        return list(self.parse_log_file_iter(file_path))
+    
+    def parse_log_file_iter(self, file_path: Union[str, Path]) -> Iterator[DHCPLogEntry]:
+        """Parse DHCP log file lazily, yielding entries while the file is read."""
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Log file not found: {file_path}")
         
         logger.info(f"Parsing DHCP log file: {file_path}")
-        
+        return self._iter_log_file(file_path)
+    
+    def _iter_log_file(self, file_path: Path) -> Iterator[DHCPLogEntry]:
+        """Yield entries from an open log file without reading it all into memory."""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                log_content = f.read()
-            
-            return self.parse_log_content(log_content)
+                yield from self.parse_log_iter(f)
         
         except Exception as e:
             logger.error(f"Error reading log file {file_path}: {e}")
@@ -599,28 +737,56 @@ class DHCPLogParser:
         logger.info("Parsing DHCP log from stream")
         
         try:
-            log_content = log_stream.read()
-            return self.parse_log_content(log_content)
+            # Iterate the stream instead of reading it into one string
+            return list(self.parse_log_iter(log_stream))
         except Exception as e:
             logger.error(f"Error reading log stream: {e}")
             raise
     
+    def parse_log_content_parallel(self, log_content: str, jobs: int = None) -> List[DHCPLogEntry]:
+        """Parse large DHCP log content across worker processes, keeping line order."""
+        if jobs == 1 or len(log_content) < PARALLEL_PARSE_CHUNK_SIZE:
+            return self.parse_log_content(log_content)
+        
+        lines = log_content.strip().split('\n')
+        chunks = list(_split_line_chunks(lines, PARALLEL_PARSE_CHUNK_SIZE))
+        logger.info(f"Parsing DHCP log content in {len(chunks)} chunks")
+        
+        entries = []
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            for chunk_entries, (parsed, errors, skipped) in executor.map(_parse_line_chunk, chunks):
+                entries.extend(chunk_entries)
+                self.parsed_count += parsed
+                self.error_count += errors
+                self.skipped_count += skipped
+        
+        return entries
+    
     def detect_log_format(self, sample_lines: List[str]) -> Optional[str]:
         """Detect the log format from sample lines."""
-        format_scores = {}
+        sample = sample_lines[:10]  # Check first 10 lines
+        detected_format = None
+        best_score = 0
         
-        for format_name, pattern in self.log_patterns.items():
+        # Ties go to the earlier format, so stop scoring a format once it can
+        # no longer beat the best so far, and stop entirely after a perfect score
+        for format_name, pattern, markers in self._format_checks:
             score = 0
-            for line in sample_lines[:10]:  # Check first 10 lines
-                if pattern.search(line):
+            for index, line in enumerate(sample):
+                if score + len(sample) - index <= best_score:
+                    break
+                if all(marker in line for marker in markers) and pattern.search(line):
                     score += 1
-            format_scores[format_name] = score
+            
+            if score > best_score:
+                detected_format, best_score = format_name, score
+                if best_score == len(sample):
+                    break
         
-        if not format_scores or max(format_scores.values()) == 0:
+        if detected_format is None:
             return None
         
-        detected_format = max(format_scores, key=format_scores.get)
-        logger.info(f"Detected log format: {detected_format} (confidence: {format_scores[detected_format]}/10)")
+        logger.info(f"Detected log format: {detected_format} (confidence: {best_score}/10)")
         return detected_format
     
     def get_statistics(self) -> Dict:
@@ -641,6 +807,34 @@ class DHCPLogParser:
         self.error_count = 0
         self.skipped_count = 0
 
+def _split_line_chunks(lines: List[str], chunk_size: int) -> Iterator[List[str]]:
+    """Group consecutive lines into chunks of roughly chunk_size characters."""
+    chunk = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+# Parser reused by every chunk a worker process handles
+_worker_parser = None
+
+def _parse_line_chunk(lines: List[str]) -> Tuple[List[DHCPLogEntry], Tuple[int, int, int]]:
+    """Parse one chunk in a worker process; return its entries and parse counters."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = DHCPLogParser()
+    
+    _worker_parser.reset_statistics()
+    entries = list(_worker_parser.parse_log_iter(lines))
+    counters = (_worker_parser.parsed_count, _worker_parser.error_count, _worker_parser.skipped_count)
+    return entries, counters
+
 def main():
     """Test the DHCP log parser with sample data."""
     print("DHCP Log Parser Test")
@@ -4,8 +4,13 @@ Enhanced classification system with fallback mechanisms for 100% detection rate.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
+# Distinct (hostname, vendor class, fingerprint, vendor) inputs remembered
+# by enhanced_classification; least recently used entries are evicted
+_CLASSIFICATION_CACHE_SIZE = 4096
+
 class EnhancedFallbackClassifier:
     """
     Fallback classification when Fingerbank fails or lacks data.
@@ -13,6 +18,9 @@ class EnhancedFallbackClassifier:
     """
     
     def __init__(self):
+        # Bounded memo of enhanced_classification results keyed by its arguments
+        self._classify_cached = lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)(self._classify_all_signals)
+        
         # Hostname pattern database for OS detection
         self.hostname_patterns = {
             # Windows patterns
@@ -602,7 +610,13 @@ class EnhancedFallbackClassifier:
                               dhcp_fingerprint: str, vendor: str) -> Dict:
         """
         Comprehensive classification using all available data with hostname prioritization.
+        Results are memoized in a bounded LRU cache; callers get their own copy.
         """
+        return dict(self._classify_cached(hostname, vendor_class, dhcp_fingerprint, vendor))
+    
+    def _classify_all_signals(self, hostname: str, vendor_class: str, 
+                              dhcp_fingerprint: str, vendor: str) -> Dict:
+        """Run every classification method in priority order."""
         result = {
             'operating_system': None,
             'device_type': None,
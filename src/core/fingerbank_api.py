@@ -5,12 +5,16 @@ Phase 5: Send device fingerprint data to Fingerbank API and store classification
 """
 
 import os
+import sys
 import time
 import json
+import sqlite3
+import hashlib
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
 import requests
 from requests.adapters import HTTPAdapter
@@ -26,6 +30,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How long a persisted Fingerbank classification is reused (seconds);
+# overridden by the FINGERBANK_CACHE_TTL environment variable
+FINGERBANK_CACHE_TTL = 7 * 24 * 3600
+
+def _cache_ttl_from_env() -> float:
+    """Read the cache TTL from the environment, falling back to the default."""
+    value = os.getenv('FINGERBANK_CACHE_TTL')
+    if not value:
+        return FINGERBANK_CACHE_TTL
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid FINGERBANK_CACHE_TTL {value!r}, using {FINGERBANK_CACHE_TTL} seconds")
+        return FINGERBANK_CACHE_TTL
+
 @dataclass
 class DeviceFingerprint:
     """Enhanced device fingerprint data for Fingerbank API v2."""
@@ -72,14 +91,46 @@ class APIRateLimit:
         self.hourly_requests = []
         self.daily_requests = []
         self.last_request_time = None
+        # Requests may be issued from several threads
+        self._lock = threading.Lock()
     
     def can_make_request(self) -> bool:
         """Check if we can make a request within rate limits."""
         now = datetime.now()
         
-        # Clean old requests from tracking
-        self._cleanup_old_requests(now)
+        with self._lock:
+            # Clean old requests from tracking
+            self._cleanup_old_requests(now)
+            return self._has_capacity()
+    
+    def reserve_request(self) -> Optional[datetime]:
+        """Check the limits and record a request in one step; None if over a limit."""
+        now = datetime.now()
         
+        # Check and record under one lock so concurrent callers cannot all
+        # pass the check before any of them is counted
+        with self._lock:
+            self._cleanup_old_requests(now)
+            if not self._has_capacity():
+                return None
+            self._append_request(now)
+            return now
+    
+    def release_request(self, reservation: datetime):
+        """Give back a slot from reserve_request for a request that failed."""
+        with self._lock:
+            for requests_list in (self.hourly_requests, self.daily_requests):
+                if reservation in requests_list:
+                    requests_list.remove(reservation)
+    
+    def record_request(self):
+        """Record a request for rate limiting."""
+        now = datetime.now()
+        with self._lock:
+            self._append_request(now)
+    
+    def _has_capacity(self) -> bool:
+        """Check both limits; the caller holds the lock."""
         # Check hourly limit
         if len(self.hourly_requests) >= self.requests_per_hour:
             return False
@@ -90,9 +141,8 @@ class APIRateLimit:
         
         return True
     
-    def record_request(self):
-        """Record a request for rate limiting."""
-        now = datetime.now()
+    def _append_request(self, now: datetime):
+        """Track a request made at now; the caller holds the lock."""
         self.hourly_requests.append(now)
         self.daily_requests.append(now)
         self.last_request_time = now
@@ -109,29 +159,36 @@ class APIRateLimit:
     
     def get_wait_time(self) -> float:
         """Get recommended wait time before next request."""
+        with self._lock:
+            return self._wait_time(datetime.now())
+    
+    def _wait_time(self, now: datetime) -> float:
+        """Seconds until the oldest tracked request leaves the hour; the caller holds the lock."""
         if not self.hourly_requests:
             return 0
         
         # Calculate time until oldest request expires
         oldest_request = min(self.hourly_requests)
         hour_from_oldest = oldest_request + timedelta(hours=1)
-        wait_time = (hour_from_oldest - datetime.now()).total_seconds()
+        wait_time = (hour_from_oldest - now).total_seconds()
         
         return max(0, wait_time)
     
     def get_status(self) -> Dict:
         """Get current rate limit status."""
         now = datetime.now()
-        self._cleanup_old_requests(now)
         
-        return {
-            "hourly_used": len(self.hourly_requests),
-            "hourly_limit": self.requests_per_hour,
-            "daily_used": len(self.daily_requests),
-            "daily_limit": self.requests_per_day,
-            "can_request": self.can_make_request(),
-            "wait_time_seconds": self.get_wait_time()
-        }
+        with self._lock:
+            self._cleanup_old_requests(now)
+            
+            return {
+                "hourly_used": len(self.hourly_requests),
+                "hourly_limit": self.requests_per_hour,
+                "daily_used": len(self.daily_requests),
+                "daily_limit": self.requests_per_day,
+                "can_request": self._has_capacity(),
+                "wait_time_seconds": self._wait_time(now)
+            }
 
 @dataclass
 class DeviceClassification:
@@ -173,12 +230,24 @@ class FingerbankAPIClient:
     Phase 5: Fingerbank Integration implementation.
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache_path: str = None, cache_ttl: float = None):
         """Initialize Fingerbank API client."""
         self.api_key = api_key or os.getenv('FINGERBANK_API_KEY')
         if not self.api_key:
             raise ValueError("Fingerbank API key is required. Set FINGERBANK_API_KEY environment variable.")
         
+        # Optional on-disk cache of classifications, reused across runs. It is
+        # an SQLite database opened on first use and shared by worker threads
+        # under the lock; any cache failure disables it rather than Fingerbank
+        self._cache_path = cache_path or os.getenv('FINGERBANK_CACHE_PATH')
+        self.cache_ttl = cache_ttl if cache_ttl is not None else _cache_ttl_from_env()
+        self._result_cache = None
+        self._result_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        
+        # Guards the request and cache counters, updated from worker threads
+        self._stats_lock = threading.Lock()
+        
         self.base_url = "https://api.fingerbank.org/api/v2"
         self.rate_limiter = APIRateLimit()
         
@@ -216,8 +285,9 @@ class FingerbankAPIClient:
     def _make_api_request(self, fingerprint: DeviceFingerprint) -> Dict:
         """Make API request to Fingerbank with rate limiting."""
         
-        # Check rate limits
-        if not self.rate_limiter.can_make_request():
+        # Reserve a slot within the rate limits; released again if the request fails
+        reservation = self.rate_limiter.reserve_request()
+        if reservation is None:
             wait_time = self.rate_limiter.get_wait_time()
             raise Exception(f"Rate limit exceeded. Wait {wait_time:.0f} seconds.")
         
@@ -253,20 +323,111 @@ class FingerbankAPIClient:
             response.raise_for_status()
             return response
         
-        # Execute request with retry logic
-        response = self._exponential_backoff_retry(make_request)
-        
-        # Record request for rate limiting
-        self.rate_limiter.record_request()
+        # Execute request with retry logic; only successful requests count
+        try:
+            response = self._exponential_backoff_retry(make_request)
+        except Exception:
+            self.rate_limiter.release_request(reservation)
+            raise
         
         return response.json()
     
+    def _result_cache_key(self, fingerprint: DeviceFingerprint) -> str:
+        """Hash the fields sent to Fingerbank into a compact key for the on-disk cache."""
+        # The full MAC is sent with the request, so it is part of the key too
+        material = '|'.join((
+            (fingerprint.mac_address or '').lower(),
+            fingerprint.dhcp_fingerprint or '',
+            fingerprint.dhcp_vendor_class or '',
+            fingerprint.hostname or '',
+            fingerprint.client_fqdn or '',
+        ))
+        return hashlib.blake2b(material.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _open_result_cache(self) -> Optional[sqlite3.Connection]:
+        """Open the on-disk cache if needed; the caller holds the cache lock."""
+        if self._result_cache is None and self._cache_path:
+            try:
+                connection = sqlite3.connect(self._cache_path, check_same_thread=False)
+                try:
+                    connection.execute(
+                        'CREATE TABLE IF NOT EXISTS classifications '
+                        '(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, classification TEXT NOT NULL)'
+                    )
+                except sqlite3.Error:
+                    connection.close()
+                    raise
+                self._result_cache = connection
+            except sqlite3.Error as e:
+                self._disable_result_cache(e)
+        return self._result_cache
+    
+    def _disable_result_cache(self, error: Exception):
+        """Stop using the on-disk cache after a failure; the caller holds the cache lock."""
+        logger.warning(f"Fingerbank cache at {self._cache_path} unavailable, continuing without it: {error}")
+        if self._result_cache is not None:
+            try:
+                self._result_cache.close()
+            except sqlite3.Error:
+                pass
+        self._result_cache = None
+        self._cache_path = None
+    
+    def _get_cached_result(self, cache_key: str) -> Optional[DeviceClassification]:
+        """Return a persisted classification that has not expired."""
+        with self._result_cache_lock:
+            cache = self._open_result_cache()
+            if cache is None:
+                return None
+            try:
+                row = cache.execute(
+                    'SELECT stored_at, classification FROM classifications WHERE key = ?', (cache_key,)
+                ).fetchone()
+                if row is None or time.time() - row[0] >= self.cache_ttl:
+                    return None
+                return DeviceClassification(**json.loads(row[1]))
+            except Exception as e:
+                self._disable_result_cache(e)
+                return None
+    
+    def _store_cached_result(self, cache_key: str, classification: DeviceClassification):
+        """Persist a classification for later runs."""
+        with self._result_cache_lock:
+            cache = self._open_result_cache()
+            if cache is None:
+                return
+            try:
+                with cache:
+                    cache.execute(
+                        'INSERT OR REPLACE INTO classifications VALUES (?, ?, ?)',
+                        (cache_key, time.time(), json.dumps(asdict(classification)))
+                    )
+            except Exception as e:
+                self._disable_result_cache(e)
+    
+    def close(self):
+        """Close the on-disk result cache; it is reopened if the client is used again."""
+        with self._result_cache_lock:
+            if self._result_cache is not None:
+                self._result_cache.close()
+                self._result_cache = None
+    
     def classify_device(self, fingerprint: DeviceFingerprint) -> DeviceClassification:
         """
         Classify device using Fingerbank API.
         Phase 5: Send MAC address and DHCP fingerprint data to API.
         """
         try:
+            cache_key = None
+            if self._cache_path:
+                cache_key = self._result_cache_key(fingerprint)
+                cached = self._get_cached_result(cache_key)
+                if cached is not None:
+                    logger.debug(f"Using cached classification for {fingerprint.mac_address}")
+                    with self._stats_lock:
+                        self.cache_hits += 1
+                    return cached
+            
             logger.debug(f"Classifying device: {fingerprint.mac_address}")
             
             # Make API request
@@ -277,10 +438,14 @@ class FingerbankAPIClient:
             
             if classification.error_message:
                 logger.warning(f"API classification warning for {fingerprint.mac_address}: {classification.error_message}")
-                self.failed_requests += 1
+                with self._stats_lock:
+                    self.failed_requests += 1
             else:
                 logger.info(f"Successfully classified {fingerprint.mac_address}: {classification.device_name}")
-                self.successful_requests += 1
+                with self._stats_lock:
+                    self.successful_requests += 1
+                if cache_key is not None:
+                    self._store_cached_result(cache_key, classification)
             
             return classification
         
@@ -288,10 +453,11 @@ class FingerbankAPIClient:
             error_msg = str(e)
             logger.error(f"API request failed for {fingerprint.mac_address}: {error_msg}")
             
-            if "Rate limit" in error_msg:
-                self.rate_limited_requests += 1
-            else:
-                self.failed_requests += 1
+            with self._stats_lock:
+                if "Rate limit" in error_msg:
+                    self.rate_limited_requests += 1
+                else:
+                    self.failed_requests += 1
             
             return DeviceClassification(
                 raw_response={},
@@ -375,6 +541,12 @@ class FingerbankAPIClient:
             elif not classification.device_name and not classification.operating_system and not classification.manufacturer:
                 classification.error_message = "No device information found in response"
             
+            # Device, OS and manufacturer names repeat across devices; share one copy each
+            for attr in ('device_name', 'operating_system', 'manufacturer'):
+                value = getattr(classification, attr)
+                if isinstance(value, str):
+                    setattr(classification, attr, sys.intern(value))
+            
             logger.debug(f"Enhanced parsing - Device: {classification.device_name}, "
                         f"OS: {classification.operating_system}, Manufacturer: {classification.manufacturer}, "
                         f"Type: {classification.device_type}, Score: {classification.confidence_score} ({classification.confidence_level})")
@@ -593,15 +765,22 @@ class FingerbankAPIClient:
         """Get API usage statistics."""
         rate_status = self.rate_limiter.get_status()
         
-        total_requests = self.successful_requests + self.failed_requests + self.rate_limited_requests
-        success_rate = (self.successful_requests / total_requests * 100) if total_requests > 0 else 0
+        with self._stats_lock:
+            successful_requests = self.successful_requests
+            failed_requests = self.failed_requests
+            rate_limited_requests = self.rate_limited_requests
+            cache_hits = self.cache_hits
+        
+        total_requests = successful_requests + failed_requests + rate_limited_requests
+        success_rate = (successful_requests / total_requests * 100) if total_requests > 0 else 0
         
         return {
             "total_requests": total_requests,
-            "successful_requests": self.successful_requests,
-            "failed_requests": self.failed_requests,
-            "rate_limited_requests": self.rate_limited_requests,
+            "successful_requests": successful_requests,
+            "failed_requests": failed_requests,
+            "rate_limited_requests": rate_limited_requests,
             "success_rate": success_rate,
+            "cache_hits": cache_hits,
             "rate_limit_status": rate_status
         }
 
@@ -5,6 +5,7 @@ Uses OUI (Organizationally Unique Identifier) database to identify device manufa
 """
 
 import os
+import sys
 import csv
 import json
 import logging
@@ -64,9 +65,12 @@ class MACVendorLookup:
                 reader = csv.DictReader(f)
                 for row in reader:
                     oui = row['oui'].upper().replace(':', '').replace('-', '')
+                    # Large vendors own many OUIs; keep one copy of each name
+                    vendor = row['vendor']
+                    vendor_full = row.get('vendor_full', vendor)
                     self.oui_database[oui] = {
-                        'vendor': row['vendor'],
-                        'vendor_full': row.get('vendor_full', row['vendor']),
+                        'vendor': sys.intern(vendor) if vendor else vendor,
+                        'vendor_full': sys.intern(vendor_full) if vendor_full else vendor_full,
                         'country': row.get('country', ''),
                         'updated': row.get('updated', '')
                     }
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the streamed JSON export of classification results.
+The export must match json.dump(indent=2) of the whole document,
+with and without orjson installed.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import dhcp_device_analyzer
+from src.core.dhcp_device_analyzer import OptimizedDHCPDeviceAnalyzer, DeviceClassificationResult
+
+def _sample_results():
+    return [
+        DeviceClassificationResult(
+            mac_address='28:39:5e:f1:65:c1',
+            ip_address='192.168.1.101',
+            hostname='héllo-iphone',
+            vendor='Apple, Inc.',
+            device_type='Phone',
+            operating_system='iOS',
+            classification_method='fingerbank',
+            overall_confidence='high',
+            fingerbank_confidence=87,
+            timestamp=datetime(2024, 12, 25, 8, 15, 23)
+        ),
+        DeviceClassificationResult(
+            mac_address='a4:c3:f0:85:ac:2d',
+            ip_address='192.168.1.102',
+            hostname='Wohnzimmer-TV-\U0001F4FA',
+            vendor='Zyxel "Comms"',
+            fingerbank_error='No device information found in response',
+            timestamp=datetime(2024, 12, 25, 8, 15, 45)
+        ),
+    ]
+
+class ExportResultsTest(unittest.TestCase):
+    """export_results output compared with the json module baseline."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.analyzer = OptimizedDHCPDeviceAnalyzer()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, results):
+        output_file = os.path.join(self.temp_dir.name, 'results.json')
+        self.analyzer.export_results(results, output_file)
+        with open(output_file, encoding='utf-8') as f:
+            return f.read()
+
+    def _baseline(self, results, exported_text):
+        """json.dumps of the full document, reusing the exported timestamp."""
+        document = {
+            'timestamp': json.loads(exported_text)['timestamp'],
+            'total_devices': len(results),
+            'classification_stats': self.analyzer.classification_stats,
+            'devices': [
+                {field: getattr(r, field) for field in dhcp_device_analyzer._EXPORT_FIELDS}
+                for r in results
+            ],
+        }
+        return json.dumps(document, indent=2, default=str)
+
+    def _assert_matches_baseline(self, results):
+        exported = self._export(results)
+        baseline = self._baseline(results, exported)
+        self.assertEqual(json.loads(exported), json.loads(baseline))
+        self.assertEqual(exported, baseline)
+
+    def test_json_module_export(self):
+        with mock.patch.object(dhcp_device_analyzer, 'orjson', None):
+            self._assert_matches_baseline(_sample_results())
+            self._assert_matches_baseline([])
+
+    @unittest.skipIf(dhcp_device_analyzer.orjson is None, 'orjson is not installed')
+    def test_orjson_export(self):
+        self._assert_matches_baseline(_sample_results())
+        self._assert_matches_baseline([])
+
+    def test_non_ascii_is_escaped(self):
+        exported = self._export(_sample_results())
+        self.assertTrue(exported.isascii())
+        self.assertIn('h\\u00e9llo-iphone', exported)
+        self.assertIn('\\ud83d\\udcfa', exported)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk Fingerbank classification cache.
+Runs without network access: API responses are supplied by the test.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+import tempfile
+import unittest
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.fingerbank_api import FingerbankAPIClient, DeviceFingerprint
+
+SAMPLE_RESPONSE = {
+    'score': 80,
+    'device': {'id': 1, 'name': 'Apple iPhone'},
+    'device_name': 'Apple iPhone',
+    'operating_system': {'id': 2, 'name': 'iOS'},
+}
+
+SAMPLE_RESPONSE_OTHER = {
+    'score': 60,
+    'device': {'id': 3, 'name': 'Samsung Galaxy'},
+    'device_name': 'Samsung Galaxy',
+    'operating_system': {'id': 4, 'name': 'Android'},
+}
+
+def _fingerprint(hostname: str = 'johns-iphone', mac_address: str = '28:39:5e:f1:65:c1') -> DeviceFingerprint:
+    return DeviceFingerprint(
+        mac_address=mac_address,
+        dhcp_fingerprint='1,3,6,15,119,252',
+        hostname=hostname
+    )
+
+class FingerbankCacheTest(unittest.TestCase):
+    """On-disk cache behaviour of FingerbankAPIClient."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'fingerbank_cache')
+        self.api_calls = 0
+        self.responses = {}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _client(self, cache_ttl: float = None) -> FingerbankAPIClient:
+        client = FingerbankAPIClient(api_key='test-key', cache_path=self.cache_path, cache_ttl=cache_ttl)
+
+        def fake_request(fingerprint):
+            self.api_calls += 1
+            return self.responses.get(fingerprint.mac_address, SAMPLE_RESPONSE)
+
+        client._make_api_request = fake_request
+        self.addCleanup(client.close)
+        return client
+
+    def test_cache_used_from_worker_threads(self):
+        client = self._client()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(client.classify_device, _fingerprint()).result()
+            results = list(executor.map(client.classify_device, [_fingerprint()] * 8))
+
+        self.assertIsNone(first.error_message)
+        self.assertEqual(self.api_calls, 1)
+        self.assertEqual(client.cache_hits, 8)
+        for result in results:
+            self.assertIsNone(result.error_message)
+            self.assertEqual(result.device_name, 'Apple iPhone')
+
+    def test_cache_persists_across_clients(self):
+        self._client().classify_device(_fingerprint())
+
+        client = self._client()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = executor.submit(client.classify_device, _fingerprint()).result()
+
+        self.assertEqual(result.device_name, 'Apple iPhone')
+        self.assertEqual(self.api_calls, 1)
+        self.assertEqual(client.cache_hits, 1)
+
+    def test_cache_reopens_after_close(self):
+        client = self._client()
+        client.classify_device(_fingerprint())
+        client.close()
+
+        client.classify_device(_fingerprint())
+        self.assertEqual(self.api_calls, 1)
+        self.assertEqual(client.cache_hits, 1)
+
+    def test_cache_stores_plain_json(self):
+        client = self._client()
+        original = client.classify_device(_fingerprint())
+        client.close()
+
+        with closing(sqlite3.connect(self.cache_path)) as connection:
+            rows = connection.execute('SELECT classification FROM classifications').fetchall()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(json.loads(rows[0][0])['device_name'], 'Apple iPhone')
+
+        cached = client.classify_device(_fingerprint())
+        self.assertEqual(cached, original)
+
+    def test_cache_keys_on_full_mac(self):
+        # Same OUI and DHCP data, but Fingerbank answers differently per MAC
+        self.responses['28:39:5e:f1:65:c2'] = SAMPLE_RESPONSE_OTHER
+        first = self._client().classify_device(_fingerprint())
+
+        client = self._client()
+        second = client.classify_device(_fingerprint(mac_address='28:39:5e:f1:65:c2'))
+        repeat = client.classify_device(_fingerprint(mac_address='28:39:5e:f1:65:c2'))
+
+        self.assertEqual(first.device_name, 'Apple iPhone')
+        self.assertEqual(second.device_name, 'Samsung Galaxy')
+        self.assertEqual(repeat.device_name, 'Samsung Galaxy')
+        self.assertEqual(self.api_calls, 2)
+        self.assertEqual(client.cache_hits, 1)
+
+    def test_expired_entries_are_refreshed(self):
+        client = self._client(cache_ttl=0)
+        client.classify_device(_fingerprint())
+        client.classify_device(_fingerprint())
+
+        self.assertEqual(self.api_calls, 2)
+        self.assertEqual(client.cache_hits, 0)
+
+    def test_unreadable_cache_falls_back_to_api(self):
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'not a cache database' * 100)
+
+        client = self._client()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(client.classify_device, [_fingerprint(), _fingerprint()]))
+
+        for result in results:
+            self.assertIsNone(result.error_message)
+            self.assertEqual(result.device_name, 'Apple iPhone')
+        self.assertEqual(self.api_calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
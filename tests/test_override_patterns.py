@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the combined hostname override regex.
+One lookahead alternation reports only the first alternative matching at
+each position, so it agrees with a per-pattern substring check only while
+no pattern is a prefix of another device type's pattern.
+"""
+
+import os
+import sys
+import logging
+import unittest
+from itertools import product
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.dhcp_device_analyzer import (
+    _OVERRIDE_HOSTNAME_PATTERNS, _OVERRIDE_HOSTNAME_RE, _OVERRIDE_TYPES
+)
+
+def _regex_types(hostname_lower: str) -> set:
+    return {
+        _OVERRIDE_TYPES[int(match.lastgroup[1:])]
+        for match in _OVERRIDE_HOSTNAME_RE.finditer(hostname_lower)
+    }
+
+def _naive_types(hostname_lower: str) -> set:
+    return {
+        device_type
+        for device_type, patterns in _OVERRIDE_HOSTNAME_PATTERNS.items()
+        if any(pattern in hostname_lower for pattern in patterns)
+    }
+
+class OverridePatternTest(unittest.TestCase):
+    """_OVERRIDE_HOSTNAME_RE against the naive per-pattern loop."""
+
+    def test_no_pattern_prefixes_another_types_pattern(self):
+        for (type_a, patterns_a), (type_b, patterns_b) in product(_OVERRIDE_HOSTNAME_PATTERNS.items(), repeat=2):
+            if type_a == type_b:
+                continue
+            for pattern_a, pattern_b in product(patterns_a, patterns_b):
+                with self.subTest(prefix=pattern_a, pattern=pattern_b):
+                    self.assertFalse(pattern_b.startswith(pattern_a))
+
+    def test_regex_matches_naive_loop(self):
+        patterns = [pattern for group in _OVERRIDE_HOSTNAME_PATTERNS.values() for pattern in group]
+        hostnames = ['', 'unknown-host']
+        hostnames += patterns
+        hostnames += [f'my-{pattern}-01' for pattern in patterns]
+        hostnames += [first + second for first, second in product(patterns, repeat=2)]
+        hostnames += [f'{first}.{second}' for first, second in product(patterns, repeat=2)]
+
+        for hostname in hostnames:
+            with self.subTest(hostname=hostname):
+                self.assertEqual(_regex_types(hostname), _naive_types(hostname))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for process-parallel DHCP log parsing.
+The parallel parse must return the same entries, in the same order,
+and the same statistics as the serial parse.
+"""
+
+import os
+import sys
+import logging
+import unittest
+from dataclasses import asdict
+from datetime import datetime
+from unittest import mock
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(TESTS_DIR))
+
+from src.core import dhcp_log_parser
+from src.core.dhcp_log_parser import DHCPLogParser
+
+SAMPLE_LOGS = [
+    os.path.join(os.path.dirname(TESTS_DIR), 'test_logs', 'realistic_home_network.log'),
+    os.path.join(os.path.dirname(TESTS_DIR), 'test_logs', 'dataset.log'),
+]
+
+# Small chunks so the sample content is split across several workers
+TEST_CHUNK_SIZE = 4096
+
+def _sample_content() -> str:
+    parts = []
+    for log_file in SAMPLE_LOGS:
+        with open(log_file, encoding='utf-8') as f:
+            parts.append(f.read())
+    # Include lines that are skipped, so the merged counters are exercised
+    parts.append('garbage line that matches nothing\n# comment line\n')
+    return ''.join(parts) * 20
+
+class ParallelParseTest(unittest.TestCase):
+    """parse_log_content_parallel compared with parse_log_content."""
+
+    def setUp(self):
+        self.content = _sample_content()
+
+    def _assert_same_entries(self, serial, parallel, started, finished):
+        self.assertEqual(len(parallel), len(serial))
+        for serial_entry, parallel_entry in zip(serial, parallel):
+            serial_fields = asdict(serial_entry)
+            parallel_fields = asdict(parallel_entry)
+            serial_timestamp = serial_fields.pop('timestamp')
+            parallel_timestamp = parallel_fields.pop('timestamp')
+            self.assertEqual(parallel_fields, serial_fields)
+            # Unparseable timestamps fall back to datetime.now(), which differs
+            # between the two parses but must fall within the test run
+            if parallel_timestamp != serial_timestamp:
+                self.assertTrue(started <= serial_timestamp <= finished)
+                self.assertTrue(started <= parallel_timestamp <= finished)
+
+    def test_matches_serial_parse(self):
+        lines = self.content.strip().split('\n')
+        chunks = list(dhcp_log_parser._split_line_chunks(lines, TEST_CHUNK_SIZE))
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual([line for chunk in chunks for line in chunk], lines)
+
+        started = datetime.now()
+        serial_parser = DHCPLogParser()
+        serial = serial_parser.parse_log_content(self.content)
+
+        parallel_parser = DHCPLogParser()
+        with mock.patch.object(dhcp_log_parser, 'PARALLEL_PARSE_CHUNK_SIZE', TEST_CHUNK_SIZE):
+            parallel = parallel_parser.parse_log_content_parallel(self.content, jobs=2)
+        finished = datetime.now()
+
+        self.assertGreater(len(serial), 0)
+        self._assert_same_entries(serial, parallel, started, finished)
+        self.assertEqual(parallel_parser.get_statistics(), serial_parser.get_statistics())
+        self.assertGreater(parallel_parser.get_statistics()['skipped_lines'], 0)
+
+    def test_small_content_is_parsed_serially(self):
+        parser = DHCPLogParser()
+        with mock.patch.object(dhcp_log_parser, 'ProcessPoolExecutor') as executor:
+            entries = parser.parse_log_content_parallel(self.content[:2000], jobs=2)
+        executor.assert_not_called()
+        self.assertEqual(len(entries), parser.get_statistics()['parsed_entries'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for Fingerbank API rate limiting under concurrent requests.
+"""
+
+import os
+import sys
+import logging
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core import fingerbank_api
+from src.core.fingerbank_api import APIRateLimit, FingerbankAPIClient, DeviceFingerprint
+
+class APIRateLimitTest(unittest.TestCase):
+    """Slot reservation from many threads at once."""
+
+    def test_concurrent_reservations_respect_hourly_limit(self):
+        rate_limiter = APIRateLimit(requests_per_hour=5, requests_per_day=1000)
+        barrier = threading.Barrier(16)
+
+        def reserve():
+            barrier.wait()
+            return rate_limiter.reserve_request()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            granted = [executor.submit(reserve) for _ in range(16)]
+            granted = [future.result() for future in granted]
+
+        self.assertEqual(sum(reservation is not None for reservation in granted), 5)
+        status = rate_limiter.get_status()
+        self.assertEqual(status['hourly_used'], 5)
+        self.assertFalse(status['can_request'])
+        self.assertGreater(status['wait_time_seconds'], 0)
+
+    def test_daily_limit(self):
+        rate_limiter = APIRateLimit(requests_per_hour=100, requests_per_day=2)
+        self.assertIsNotNone(rate_limiter.reserve_request())
+        self.assertIsNotNone(rate_limiter.reserve_request())
+        self.assertIsNone(rate_limiter.reserve_request())
+        self.assertFalse(rate_limiter.can_make_request())
+
+    def test_released_slot_can_be_reused(self):
+        rate_limiter = APIRateLimit(requests_per_hour=1, requests_per_day=1000)
+        reservation = rate_limiter.reserve_request()
+        self.assertIsNone(rate_limiter.reserve_request())
+
+        rate_limiter.release_request(reservation)
+        self.assertEqual(rate_limiter.get_status()['hourly_used'], 0)
+        self.assertIsNotNone(rate_limiter.reserve_request())
+
+class ClientRateLimitTest(unittest.TestCase):
+    """Only requests that succeed count against the client's quota."""
+
+    def setUp(self):
+        # No on-disk cache, so every classification reaches the (mocked) API
+        with mock.patch.dict(os.environ, {'FINGERBANK_CACHE_PATH': ''}):
+            self.client = FingerbankAPIClient(api_key='test-key')
+        self.fingerprint = DeviceFingerprint(mac_address='28:39:5e:f1:65:c1', hostname='johns-iphone')
+
+    def test_failed_request_does_not_use_quota(self):
+        with mock.patch.object(self.client.session, 'get', side_effect=requests.ConnectionError('offline')), \
+             mock.patch.object(fingerbank_api.time, 'sleep'):
+            result = self.client.classify_device(self.fingerprint)
+
+        self.assertIn('offline', result.error_message)
+        self.assertEqual(self.client.rate_limiter.get_status()['hourly_used'], 0)
+        self.assertEqual(self.client.get_api_statistics()['failed_requests'], 1)
+
+    def test_successful_request_uses_quota(self):
+        response = mock.Mock()
+        response.json.return_value = {'score': 80, 'device_name': 'Apple iPhone',
+                                      'device': {'id': 1, 'name': 'Apple iPhone'}}
+        with mock.patch.object(self.client.session, 'get', return_value=response):
+            result = self.client.classify_device(self.fingerprint)
+
+        self.assertIsNone(result.error_message)
+        self.assertEqual(self.client.rate_limiter.get_status()['hourly_used'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
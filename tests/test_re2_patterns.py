@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests that the optional RE2 backend matches log lines exactly like re.
+Skipped when the google-re2 package is not installed.
+"""
+
+import os
+import re
+import sys
+import logging
+import unittest
+
+# Suppress logging output for cleaner test results
+logging.disable(logging.CRITICAL)
+
+# Add parent directory to path for imports
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(TESTS_DIR))
+
+from src.core import dhcp_log_parser
+from src.core.dhcp_log_parser import DHCPLogParser
+
+SAMPLE_LOGS = [
+    os.path.join(os.path.dirname(TESTS_DIR), 'test_logs', 'realistic_home_network.log'),
+    os.path.join(os.path.dirname(TESTS_DIR), 'test_logs', 'dataset.log'),
+]
+
+# One line per log format not covered by the sample logs
+EXTRA_LINES = [
+    'Dec 25 14:30:45 router dhcpd[1234]: DHCPACK on 192.168.1.100 to aa:bb:cc:dd:ee:ff (MyLaptop) via eth0',
+    'Dec 25 14:30:46 router dhcpd: DHCPREQUEST for 192.168.1.140 from 00:17:88:01:02:03 (hue-bridge) via eth0',
+    'Dec 25 14:30:47 router dhcpd: DHCPDISCOVER from b8:27:eb:01:02:03 via eth0',
+    'Dec 25 14:30:48 dhcpd: DHCPACK on 192.168.1.107 to aa:bb:cc:dd:ee:01 (tablet) via eth0',
+    'Dec 25 08:15:32 gw dhcpd: DHCPACK on 192.168.1.170 to 00:50:56:aa:bb:cc (ubuntu-server): vendor_class "dhcpcd-9.4"',
+    '10,12/25/23,14:30:45,Assign,192.168.1.141,xbox-one,00-1A-11-22-33-44',
+    'Dec 25 14:31:15 dhcp,info bridge assigned 192.168.1.103 to aa:bb:cc:dd:ee:f1',
+    'Dec 25 14:31:16 RouterOS assigned 192.168.1.104 to 00:11:32:45:78:90',
+    'Dec 25 14:31:18 192.168.1.1 dhcp assigned 192.168.1.106 to 00:11:32:45:78:91 hostname nas',
+    'Dec 25 14:31:17 router kernel: \\[DHCP\\] ACK 192.168.1.105 to 04:a1:51:33:44:55 (nintendo-switch)',
+    'Dec 25 08:15:29 192.168.1.1 dhcp: DHCP-DISCOVER from MAC 00:16:32:11:22:33 hostname vendor-class-test',
+    'Dec 25 08:15:23 192.168.1.1 dhcp: DHCP-ACK sent to 192.168.1.150 for MAC 5c:f9:38:98:76:54 '
+    'hostname galaxy-s23 requesting 192.168.1.150: DHCP-OPTIONS: 55=[1, 3, 6, 15], 60="android-dhcp-13"',
+    'garbage line that matches nothing',
+]
+
+# The xfinity pattern escapes its bracket as \\[ inside a raw string, so no
+# real gateway line matches it; it is still compared on every line above
+UNMATCHED_FORMATS = {'xfinity_gateway'}
+
+def _sample_lines():
+    lines = list(EXTRA_LINES)
+    for log_file in SAMPLE_LOGS:
+        with open(log_file, encoding='utf-8') as f:
+            lines.extend(line.strip() for line in f)
+    return lines
+
+@unittest.skipIf(dhcp_log_parser.re2 is None, 're2 (google-re2) is not installed')
+class RE2PatternTest(unittest.TestCase):
+    """Every log format compiled with RE2 behaves like its re counterpart."""
+
+    def setUp(self):
+        self.parser = DHCPLogParser()
+
+    def test_every_format_compiles_with_re2(self):
+        for format_name, pattern in self.parser.log_patterns.items():
+            with self.subTest(format_name=format_name):
+                self.assertNotIsInstance(pattern, re.Pattern)
+
+    def test_matches_agree_with_re(self):
+        lines = _sample_lines()
+        matched_formats = set()
+        for format_name, pattern in self.parser.log_patterns.items():
+            reference = re.compile(pattern.pattern)
+            for line in lines:
+                expected = reference.search(line)
+                actual = pattern.search(line)
+                with self.subTest(format_name=format_name, line=line):
+                    self.assertEqual(actual is None, expected is None)
+                    if expected is not None:
+                        matched_formats.add(format_name)
+                        self.assertEqual(actual.span(), expected.span())
+                        self.assertEqual(actual.groupdict(), expected.groupdict())
+        self.assertEqual(matched_formats, set(self.parser.log_patterns) - UNMATCHED_FORMATS)
+
+if __name__ == '__main__':
+    unittest.main()